@@ -5,6 +5,11 @@ import os
 import platform
 import shutil
 import sys
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, packages_distributions, version
+
+# Make project root importable when running from scripts/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
 def _mem_total_gb() -> float | None:
@@ -19,6 +24,14 @@ def _mem_total_gb() -> float | None:
     return None
 
 
+@lru_cache(maxsize=1)
+def _module_distributions() -> dict:
+    try:
+        return packages_distributions()
+    except Exception:
+        return {}
+
+
 def main() -> None:
     print("SPLF Environment Check")
     print("-" * 60)
@@ -27,22 +40,36 @@ def main() -> None:
     print(f"Python: {sys.version.split()[0]}")
     print(f"Platform: {platform.platform()} ({platform.machine()})")
     print(f"CPU cores: {os.cpu_count() or 1}")
+    try:
+        from splf.utils.io import available_cpus
+
+        eff_cpus = available_cpus()
+    except Exception:
+        eff_cpus = os.cpu_count() or 1
+    print(f"Effective CPUs: {eff_cpus}")
     mem_gb = _mem_total_gb()
     if mem_gb:
         print(f"RAM: {mem_gb} GB")
 
-    # Core packages
-    def v(mod):
+    # Core packages: versions come from installed metadata, so nothing heavy gets imported
+    def v(name):
         try:
-            m = __import__(mod)
-            return getattr(m, "__version__", "unknown")
-        except Exception:
-            return "missing"
+            return version(name)
+        except PackageNotFoundError:
+            pass
+        # Module name whose distribution is named differently (e.g. cupy-cuda12x, cuml-cu12)
+        dists = _module_distributions().get(name)
+        if dists:
+            try:
+                return version(dists[0])
+            except PackageNotFoundError:
+                pass
+        return "missing"
 
     print("Packages:")
     print(f"  numpy: {v('numpy')}")
     print(f"  pandas: {v('pandas')}")
-    print(f"  scikit-learn: {v('sklearn')}")
+    print(f"  scikit-learn: {v('scikit-learn')}")
 
     # GPU / cuML
     has_gpu = False
@@ -77,18 +104,14 @@ def main() -> None:
     print("-" * 60)
     sym_count = 1
     try:
-        import yaml  # type: ignore
+        from splf.utils.io import load_yaml, resolve_symbols
 
         if os.path.exists("config/config.yaml"):
-            with open("config/config.yaml", "r") as f:
-                cfg = yaml.safe_load(f)
-                uni = cfg.get("universe", {})
-                symbols = uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", []))
-                sym_count = max(1, len(symbols))
+            sym_count = max(1, len(resolve_symbols(load_yaml("config/config.yaml"))))
     except Exception:
         pass
 
-    cpu_cores = os.cpu_count() or 1
+    cpu_cores = eff_cpus
     suggested_workers = max(1, min(sym_count, cpu_cores))
     print(f"Suggested runtime.workers: {suggested_workers} (symbols={sym_count}, cores={cpu_cores})")
     if has_gpu and cuml_ver != "missing":
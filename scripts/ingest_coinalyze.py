@@ -2,20 +2,26 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
 
+import numpy as np
 import pandas as pd
-import requests
+import pyarrow.parquet as pq
+import urllib3
 
 # Make project root importable when running from scripts/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from splf.utils.io import ensure_dir, load_yaml
+from splf.utils.http import RateLimiter, json_loads, make_pool_manager
+from splf.utils.io import PARQUET_WRITE_OPTIONS, ensure_dir, load_yaml, resolve_symbols, save_json
 
 
 def _to_ms(dt: datetime) -> int:
@@ -34,66 +40,135 @@ def _detect_keys(sample: dict, ts_cands: List[str], val_cands: List[str]) -> tup
     return ts_key, v_key
 
 
-def _get_json(sess: requests.Session, url: str, params: dict, headers: dict, min_sleep: float = 1.5) -> Optional[List[dict]]:
-    r = sess.get(url, params=params, headers=headers, timeout=30)
-    if r.status_code == 429:
-        ra = r.headers.get("Retry-After")
-        try:
-            wait_s = max(min_sleep, float(ra)) if ra is not None else 2.0
-        except Exception:
-            wait_s = 2.0
-        print(f"[COINALYZE] 429 rate limit; sleeping {wait_s}s … params={params}")
-        time.sleep(wait_s)
-        return _get_json(sess, url, params, headers, min_sleep)
-    if r.status_code != 200:
-        print(f"[COINALYZE] HTTP {r.status_code} {url} params={params} body={(r.text or '')[:200]}…")
+def _num(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _floats(data: List[dict], key: str) -> np.ndarray:
+    return np.fromiter((_num(d.get(key)) for d in data), dtype=np.float64, count=len(data))
+
+
+def _frame(data: List[dict], ts_key: str, cols: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame from typed field arrays on a UTC ms index (rows with a missing timestamp dropped)."""
+    ts = _floats(data, ts_key)
+    keep = ~np.isnan(ts)
+    idx = pd.DatetimeIndex(pd.to_datetime(ts[keep], unit="ms", utc=True), name="ts")
+    return pd.DataFrame({c: v[keep] for c, v in cols.items()}, index=idx).sort_index()
+
+
+def _parquet_ts_range(path: Path) -> Optional[tuple[pd.Timestamp, pd.Timestamp]]:
+    """(min, max) of the ts column from the parquet footer statistics alone (no data pages read)."""
+    try:
+        meta = pq.read_metadata(path)
+        col = meta.schema.names.index("ts")
+    except (OSError, ValueError):
+        return None
+    lo = hi = None
+    for i in range(meta.num_row_groups):
+        st = meta.row_group(i).column(col).statistics
+        if st is None or not st.has_min_max:
+            return None
+        lo = st.min if lo is None else min(lo, st.min)
+        hi = st.max if hi is None else max(hi, st.max)
+    if lo is None:
+        return None
+    lo, hi = pd.Timestamp(lo), pd.Timestamp(hi)
+    return (lo if lo.tzinfo else lo.tz_localize("UTC")), (hi if hi.tzinfo else hi.tz_localize("UTC"))
+
+
+# Returned by _get_json on HTTP 304: the series is unchanged since the validators were stored
+NOT_MODIFIED: Any = object()
+
+
+def _get_json(
+    http: urllib3.PoolManager, url: str, params: dict, validators: Optional[Dict[str, str]] = None
+) -> Optional[List[dict]]:
+    """GET url?params and decode the JSON body (None on error).
+
+    validators holds the ETag / Last-Modified of the last 200 for this task. They are sent as
+    If-None-Match / If-Modified-Since when the query is unchanged (a 304 returns NOT_MODIFIED),
+    and replaced in place by the new response's validators on a 200.
+    """
+    query = f"{url}?{urlencode(sorted(params.items()))}"
+    headers = {}
+    if validators and validators.get("query") == query:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    # 429/5xx backoff (honoring Retry-After) is handled by the pool's urllib3 Retry
+    r = http.request("GET", url, fields=params, headers=headers or None)
+    if r.status == 304 and headers:
+        return NOT_MODIFIED
+    if r.status != 200:
+        print(f"[COINALYZE] HTTP {r.status} {url} params={params} body={r.data[:200].decode('utf-8', 'replace')}…")
         return None
     try:
-        return r.json()
-    except Exception:
-        print(f"[COINALYZE] Non-JSON response ({len(r.text)} bytes): {(r.text or '')[:200]}…")
+        # Parse the raw bytes (orjson when installed)
+        data = json_loads(r.data)
+    except ValueError:
+        print(f"[COINALYZE] Non-JSON response ({len(r.data)} bytes): {r.data[:200].decode('utf-8', 'replace')}…")
         return None
+    if validators is not None:
+        validators.clear()
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if etag or last_modified:
+            validators.update({"query": query, "etag": etag or "", "last_modified": last_modified or ""})
+    return data
 
 
-def fetch_oi(api_key: str, market: str, start: datetime, endpoint: str, interval: str) -> pd.DataFrame:
-    sess = requests.Session()
-    headers = {"X-API-KEY": api_key, "User-Agent": "splf-backtest/1.0"}
+def fetch_oi(
+    http: urllib3.PoolManager,
+    market: str,
+    start: datetime,
+    endpoint: str,
+    interval: str,
+    validators: Optional[Dict[str, str]] = None,
+) -> Optional[pd.DataFrame]:
     params = {"market": market, "interval": interval, "startTime": _to_ms(start)}
-    data = _get_json(sess, endpoint, params, headers)
+    data = _get_json(http, endpoint, params, validators)
+    if data is NOT_MODIFIED:
+        return None
     if not data:
         return pd.DataFrame(columns=["ts", "oi"]).set_index(pd.DatetimeIndex([], tz="UTC"))
     ts_key, oi_key = _detect_keys(data[0], ["timestamp", "time", "t", "ts"], ["open_interest", "oi", "openInterest", "value"])
     if not ts_key or not oi_key:
         print(f"[COINALYZE] OI: cannot detect keys in sample {list(data[0].keys())}")
         return pd.DataFrame(columns=["ts", "oi"]).set_index(pd.DatetimeIndex([], tz="UTC"))
-    df = pd.DataFrame(data)[[ts_key, oi_key]].rename(columns={ts_key: "ts", oi_key: "oi"})
-    df["ts"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
-    df["oi"] = pd.to_numeric(df["oi"], errors="coerce")
-    return df.dropna(subset=["ts"]).set_index("ts").sort_index()
+    return _frame(data, ts_key, {"oi": _floats(data, oi_key)})
 
 
-def fetch_funding(api_key: str, market: str, start: datetime, endpoint: str) -> pd.DataFrame:
-    sess = requests.Session()
-    headers = {"X-API-KEY": api_key, "User-Agent": "splf-backtest/1.0"}
+def fetch_funding(
+    http: urllib3.PoolManager, market: str, start: datetime, endpoint: str, validators: Optional[Dict[str, str]] = None
+) -> Optional[pd.DataFrame]:
     params = {"market": market, "startTime": _to_ms(start)}
-    data = _get_json(sess, endpoint, params, headers)
+    data = _get_json(http, endpoint, params, validators)
+    if data is NOT_MODIFIED:
+        return None
     if not data:
         return pd.DataFrame(columns=["ts", "funding_now"]).set_index(pd.DatetimeIndex([], tz="UTC"))
     ts_key, fr_key = _detect_keys(data[0], ["timestamp", "time", "t", "ts"], ["funding_rate", "fundingRate", "value", "rate"])
     if not ts_key or not fr_key:
         print(f"[COINALYZE] Funding: cannot detect keys in sample {list(data[0].keys())}")
         return pd.DataFrame(columns=["ts", "funding_now"]).set_index(pd.DatetimeIndex([], tz="UTC"))
-    df = pd.DataFrame(data)[[ts_key, fr_key]].rename(columns={ts_key: "ts", fr_key: "funding_now"})
-    df["ts"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
-    df["funding_now"] = pd.to_numeric(df["funding_now"], errors="coerce")
-    return df.dropna(subset=["ts"]).set_index("ts").sort_index()
+    return _frame(data, ts_key, {"funding_now": _floats(data, fr_key)})
 
 
-def fetch_liqs(api_key: str, market: str, start: datetime, endpoint: str, interval: str = "1m") -> pd.DataFrame:
-    sess = requests.Session()
-    headers = {"X-API-KEY": api_key, "User-Agent": "splf-backtest/1.0"}
+def fetch_liqs(
+    http: urllib3.PoolManager,
+    market: str,
+    start: datetime,
+    endpoint: str,
+    interval: str = "1m",
+    validators: Optional[Dict[str, str]] = None,
+) -> Optional[pd.DataFrame]:
     params = {"market": market, "interval": interval, "startTime": _to_ms(start)}
-    data = _get_json(sess, endpoint, params, headers)
+    data = _get_json(http, endpoint, params, validators)
+    if data is NOT_MODIFIED:
+        return None
     if not data:
         return pd.DataFrame(columns=["ts", "side", "price", "qty"]).set_index(pd.DatetimeIndex([], tz="UTC"))
     sample = data[0]
@@ -104,18 +179,13 @@ def fetch_liqs(api_key: str, market: str, start: datetime, endpoint: str, interv
     if not ts_key or not qty_key:
         print(f"[COINALYZE] Liqs: cannot detect keys in sample {list(sample.keys())}")
         return pd.DataFrame(columns=["ts", "side", "price", "qty"]).set_index(pd.DatetimeIndex([], tz="UTC"))
-    cols = {ts_key: "ts"}
+    cols: Dict[str, np.ndarray] = {}
     if side_key:
-        cols[side_key] = "side"
+        cols["side"] = np.array([d.get(side_key) for d in data], dtype=object)
     if price_key:
-        cols[price_key] = "price"
-    cols[qty_key] = "qty"
-    df = pd.DataFrame(data)[list(cols.keys())].rename(columns=cols)
-    df["ts"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
-    for c in ["qty", "price"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df.dropna(subset=["ts"]).set_index("ts").sort_index()
+        cols["price"] = _floats(data, price_key)
+    cols["qty"] = _floats(data, qty_key)
+    return _frame(data, ts_key, cols)
 
 
 def main() -> None:
@@ -124,13 +194,13 @@ def main() -> None:
     ap.add_argument("--symbols", nargs="*", help="Override symbols (default from config)")
     ap.add_argument("--start", help="Override period.start (YYYY-MM-DD)")
     ap.add_argument("--end", help="Override period.end (YYYY-MM-DD)")
+    ap.add_argument("--full", action="store_true", help="Refetch from the period start even where parquet files already have data")
     args = ap.parse_args()
 
     cfg = load_yaml(args.config)
     paths = cfg["paths"]
     ingest_dir = Path(paths.get("ingest_dir", "data/ingest-binance"))
-    uni = cfg.get("universe", {})
-    symbols = args.symbols or (uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", [])))
+    symbols = args.symbols or resolve_symbols(cfg)
     per = cfg.get("period", {})
     s0 = args.start or per.get("start")
     e0 = args.end or per.get("end")
@@ -153,31 +223,67 @@ def main() -> None:
     ep_fr = ing.get("endpoint_funding", "https://api.coinalyze.net/v1/funding-rate-history")
     ep_lq = ing.get("endpoint_liq", "https://api.coinalyze.net/v1/liquidation-history")
 
-    for sym in symbols:
-        market = f"{market_prefix}{sym}"
-        out_dir = ensure_dir(ingest_dir / sym)
-        print(f"Coinalyze ingest {sym} ({market}): {s0} → {e0}")
-        # OI
-        df_oi = fetch_oi(api_key, market, s, ep_oi, interval)
-        if not df_oi.empty:
-            df_oi.to_parquet(out_dir / "oi_coinalyze.parquet")
-            print(f"  oi: {len(df_oi)} rows → {out_dir / 'oi_coinalyze.parquet'}")
-        else:
-            print("  oi: no data (Coinalyze)")
-        # Funding
-        df_fr = fetch_funding(api_key, market, s, ep_fr)
-        if not df_fr.empty:
-            df_fr.to_parquet(out_dir / "funding_coinalyze.parquet")
-            print(f"  funding: {len(df_fr)} rows → {out_dir / 'funding_coinalyze.parquet'}")
-        else:
-            print("  funding: no data (Coinalyze)")
-        # Liquidations
-        df_lq = fetch_liqs(api_key, market, s, ep_lq, interval=("1m" if interval == "1m" else "5m"))
-        if not df_lq.empty:
-            df_lq.to_parquet(out_dir / "liq_coinalyze.parquet")
-            print(f"  liq: {len(df_lq)} rows → {out_dir / 'liq_coinalyze.parquet'}")
-        else:
-            print("  liq: no data (Coinalyze)")
+    # One keep-alive urllib3 pool for every task; retries 429/5xx honoring Retry-After
+    workers = int(ing.get("workers", 4))
+    http = make_pool_manager(
+        pool_size=max(workers, 1),
+        retries=5,
+        backoff_factor=1.5,
+        status_forcelist=(429, 502, 503, 504),
+        headers={"X-API-KEY": api_key, "User-Agent": "splf-backtest/1.0"},
+    )
+    # Coinalyze allows ~40 calls/min per key; the limiter is shared by all threads
+    limiter = RateLimiter(rate=float(ing.get("max_requests_per_min", 40)) / 60.0, burst=max(workers, 1))
+    fetchers = {
+        "oi": lambda market, start, v: fetch_oi(http, market, start, ep_oi, interval, v),
+        "funding": lambda market, start, v: fetch_funding(http, market, start, ep_fr, v),
+        "liq": lambda market, start, v: fetch_liqs(http, market, start, ep_lq, ("1m" if interval == "1m" else "5m"), v),
+    }
+    # ETag / Last-Modified per (symbol, kind) from earlier runs; re-runs over the same window get 304s
+    etag_path = ingest_dir / ".etag.json"
+    etags: Dict[str, Dict[str, str]] = json.loads(etag_path.read_text()) if etag_path.exists() else {}
+    etag_lock = threading.Lock()
+
+    def _ingest_one(sym: str, kind: str) -> str:
+        out = ensure_dir(ingest_dir / sym) / f"{kind}_coinalyze.parquet"
+        key = f"{sym}/{kind}"
+        # Only revalidate when the file the validators describe is still on disk
+        with etag_lock:
+            validators = dict(etags.get(key, {})) if out.exists() and not args.full else {}
+        # Incremental: when the file already covers the period start, fetch only from its last ts
+        # (inclusive, so a bar that was still forming gets replaced) and splice onto the old rows
+        start = s
+        have = None if args.full or not out.exists() else _parquet_ts_range(out)
+        if have is not None and have[0] <= pd.Timestamp(s):
+            start = max(s, have[1].to_pydatetime())
+        limiter.acquire()
+        df = fetchers[kind](f"{market_prefix}{sym}", start, validators)
+        if df is None:
+            return f"[{sym}] {kind}: not modified, kept {out}"
+        if df.empty:
+            return f"[{sym}] {kind}: no data (Coinalyze)" if start == s else f"[{sym}] {kind}: no new rows, kept {out}"
+        n_new = len(df)
+        if start > s:
+            old = pd.read_parquet(out)
+            df = pd.concat([old[old.index < pd.Timestamp(start)], df])
+        # Frames come out of _frame sorted by ts, so row-group statistics are tight time ranges
+        df.to_parquet(out, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
+        # Validators are recorded only once the data they describe is written
+        with etag_lock:
+            etags[key] = validators
+        return f"[{sym}] {kind}: {len(df)} rows ({n_new} fetched) → {out}"
+
+    print(f"Coinalyze ingest {len(symbols)} symbols ({market_prefix}…): {s0} → {e0} with {workers} threads")
+    tasks = [(sym, kind) for sym in symbols for kind in fetchers]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as ex:
+        futs = {ex.submit(_ingest_one, sym, kind): (sym, kind) for sym, kind in tasks}
+        for fut in as_completed(futs):
+            sym, kind = futs[fut]
+            try:
+                print(fut.result())
+            except Exception as exc:
+                print(f"[{sym}] {kind}: error {exc}")
+    save_json(etag_path, {k: v for k, v in etags.items() if v})
 
 
 if __name__ == "__main__":
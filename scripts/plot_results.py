@@ -8,13 +8,19 @@ from pathlib import Path
 from typing import Optional
 
 import json
+import numpy as np
 import pandas as pd
+import matplotlib
+
+# Files only: no interactive canvas; long minute lines are drawn in chunks
+matplotlib.use("Agg")
+matplotlib.rcParams["agg.path.chunksize"] = 10000
 import matplotlib.pyplot as plt
 
 # Make project root importable when running from scripts/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from splf.utils.io import load_yaml
+from splf.utils.io import find_alerts, load_yaml, read_alerts, resolve_symbols
 
 
 def plot_metrics_bars(metrics_path: Path, out_dir: Path) -> Optional[Path]:
@@ -52,15 +58,35 @@ def plot_metrics_bars(metrics_path: Path, out_dir: Path) -> Optional[Path]:
     return out
 
 
+def downsample(s: pd.Series, n: int = 4000) -> pd.DataFrame:
+    """Bucket s into ~n consecutive runs and keep each run's min/max/last (indexed by its last ts)."""
+    step = max(1, len(s) // n)
+    if step == 1:
+        return pd.DataFrame({"min": s, "max": s, "last": s})
+    buckets = np.arange(len(s)) // step
+    agg = s.groupby(buckets).agg(["min", "max", "last"])
+    agg.index = s.index[np.minimum((agg.index.to_numpy() + 1) * step, len(s)) - 1]
+    return agg
+
+
+def _plot_minute(ax, s: pd.Series, label: str) -> None:
+    # No pixel can show 100k+ minutes: draw the bucket closes and shade the in-bucket range
+    d = downsample(s)
+    (line,) = ax.plot(d.index, d["last"], label=label, rasterized=True)
+    if len(d) < len(s):
+        ax.fill_between(d.index, d["min"], d["max"], color=line.get_color(), alpha=0.25, linewidth=0, rasterized=True)
+
+
 def plot_symbol_overview(cfg: dict, symbol: str) -> Optional[Path]:
     paths = cfg["paths"]
     p_min = Path(paths["processed_dir"]) / symbol / "minute.parquet"
-    p_alerts = Path(paths["artifacts_dir"]) / "alerts" / f"{symbol}.csv"
+    p_alerts = find_alerts(Path(paths["artifacts_dir"]) / "alerts", symbol)
     if not p_min.exists():
         print(f"Missing {p_min}")
         return None
     df = pd.read_parquet(p_min)
-    alerts = pd.read_csv(p_alerts, parse_dates=["ts"]) if p_alerts.exists() else pd.DataFrame()
+    # Only alert times are drawn; parquet when present, else the typed Arrow CSV reader
+    alerts = read_alerts(p_alerts, columns=["ts"]) if p_alerts is not None else pd.DataFrame()
 
     # Select a few available columns
     cols = {
@@ -80,30 +106,32 @@ def plot_symbol_overview(cfg: dict, symbol: str) -> Optional[Path]:
     if cols["price"]:
         ax = axes[i]; i += 1
         for c in cols["price"]:
-            ax.plot(df.index, df[c], label=c)
+            _plot_minute(ax, df[c], c)
         ax.set_ylabel("Price"); ax.legend(loc="upper left"); ax.grid(True, alpha=0.3)
         if not alerts.empty and "perp_mark" in df.columns:
-            ax.scatter(alerts["ts"], df.reindex(alerts["ts"])["perp_mark"], s=12, color="red", label="alerts")
+            # Binary search on the sorted minute index (last mark at or before each alert)
+            alerts_ts = pd.DatetimeIndex(alerts["ts"])
+            ax.scatter(alerts_ts, df["perp_mark"].asof(alerts_ts).to_numpy(), s=12, color="red", label="alerts")
             ax.legend(loc="upper left")
     if cols["perp_impulse"]:
         ax = axes[i]; i += 1
         for c in cols["perp_impulse"]:
-            ax.plot(df.index, df[c], label=c)
+            _plot_minute(ax, df[c], c)
         ax.set_ylabel("perp_impulse"); ax.legend(loc="upper left"); ax.grid(True, alpha=0.3)
     if cols["funding"]:
         ax = axes[i]; i += 1
         for c in cols["funding"]:
-            ax.plot(df.index, df[c], label=c)
+            _plot_minute(ax, df[c], c)
         ax.set_ylabel("funding"); ax.legend(loc="upper left"); ax.grid(True, alpha=0.3)
     if cols["oi"]:
         ax = axes[i]; i += 1
         for c in cols["oi"]:
-            ax.plot(df.index, df[c], label=c)
+            _plot_minute(ax, df[c], c)
         ax.set_ylabel("OI"); ax.legend(loc="upper left"); ax.grid(True, alpha=0.3)
     if cols["liq"]:
         ax = axes[i]; i += 1
         for c in cols["liq"]:
-            ax.plot(df.index, df[c], label=c)
+            _plot_minute(ax, df[c], c)
         ax.set_ylabel("liq"); ax.legend(loc="upper left"); ax.grid(True, alpha=0.3)
 
     fig.suptitle(f"{symbol} — overview")
@@ -124,8 +152,7 @@ def main() -> None:
 
     cfg = load_yaml(args.config)
     paths = cfg["paths"]
-    uni = cfg.get("universe", {})
-    symbols = args.symbol and [args.symbol] or (uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", [])))
+    symbols = [args.symbol] if args.symbol else resolve_symbols(cfg)
     if not symbols:
         print("No symbols configured")
         return
@@ -7,27 +7,26 @@ import sys
 from pathlib import Path
 from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 # Make project root importable when running from scripts/
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from splf.utils.io import load_yaml
+from splf.utils.io import load_yaml, resolve_symbols
 
 
 def _false_ranges(mask: pd.Series) -> list[Tuple[pd.Timestamp, pd.Timestamp]]:
     """Return contiguous ranges where mask is False as (start, end)."""
     if mask.empty:
         return []
-    s = (~mask).astype(int)
-    if s.sum() == 0:
-        return []
-    diff = s.diff().fillna(s.iloc[0])
-    starts = s.index[(diff == 1)]
-    ends = s.index[(diff == -1)]
-    if len(ends) < len(starts):
-        ends = ends.append(pd.Index([s.index[-1]]))
-    return list(zip(starts, ends))
+    neg = ~mask.to_numpy(dtype=bool, na_value=False)
+    # Rising/falling edges of the padded False indicator; a run ends at the next True bar (or the last bar)
+    d = np.diff(np.concatenate(([0], neg.view(np.int8), [0])))
+    starts = np.flatnonzero(d == 1)
+    ends = np.minimum(np.flatnonzero(d == -1), len(neg) - 1)
+    idx = mask.index
+    return list(zip(idx[starts], idx[ends]))
 
 
 def main() -> None:
@@ -42,8 +41,7 @@ def main() -> None:
 
     cfg = load_yaml(args.config)
     paths = cfg["paths"]
-    uni = cfg.get("universe", {})
-    symbols = args.symbol and [args.symbol] or (uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", [])))
+    symbols = [args.symbol] if args.symbol else resolve_symbols(cfg)
     if not symbols:
         print("No symbols configured")
         return
@@ -64,15 +62,24 @@ def main() -> None:
     price_cols = [c for c in ("perp_mark", "index_px") if c in df.columns]
     basis_bps = None
     if {"perp_mark", "index_px"}.issubset(df.columns):
-        with pd.option_context("mode.use_inf_as_na", True):
-            basis_bps = (df["perp_mark"] - df["index_px"]) / df["index_px"] * 10000.0
+        idx_px = df["index_px"].to_numpy(dtype=np.float64)
+        pm = df["perp_mark"].to_numpy(dtype=np.float64)
+        # Zero index price → NaN rather than ±inf
+        with np.errstate(divide="ignore", invalid="ignore"):
+            basis = np.where(idx_px != 0, (pm - idx_px) / idx_px * 10000.0, np.nan)
+        basis_bps = pd.Series(basis, index=df.index)
 
     spread = df.get("spread_bps")
     flow_imb = None
     if {"taker_buy_qty", "taker_sell_qty"}.issubset(df.columns):
         flow_imb = (df["taker_buy_qty"] - df["taker_sell_qty"]).rolling("15T", min_periods=1).sum()
 
-    # Plot
+    # Plot (headless Agg unless an interactive window was asked for)
+    import matplotlib
+
+    if not args.show:
+        matplotlib.use("Agg")
+    matplotlib.rcParams["agg.path.chunksize"] = 10000
     import matplotlib.pyplot as plt
 
     nrows = 1 + (basis_bps is not None) + (spread is not None) + (flow_imb is not None)
@@ -84,7 +91,7 @@ def main() -> None:
     # Prices
     ax = axes[ax_idx]
     for c in price_cols:
-        ax.plot(df.index, df[c], label=c)
+        ax.plot(df.index, df[c], label=c, rasterized=True)
     ax.set_ylabel("Price")
     ax.legend(loc="upper left")
     ax.grid(True, alpha=0.3)
@@ -93,7 +100,7 @@ def main() -> None:
     # Basis
     if basis_bps is not None:
         ax = axes[ax_idx]
-        ax.plot(df.index, basis_bps, color="tab:purple", label="basis_bps")
+        ax.plot(df.index, basis_bps, color="tab:purple", label="basis_bps", rasterized=True)
         ax.axhline(0, color="#666", linewidth=0.8)
         ax.set_ylabel("Basis (bps)")
         ax.legend(loc="upper left")
@@ -103,7 +110,7 @@ def main() -> None:
     # Spread
     if spread is not None:
         ax = axes[ax_idx]
-        ax.plot(df.index, spread, color="tab:orange", label="spread_bps")
+        ax.plot(df.index, spread, color="tab:orange", label="spread_bps", rasterized=True)
         ax.set_ylabel("Spread (bps)")
         ax.legend(loc="upper left")
         ax.grid(True, alpha=0.3)
@@ -112,7 +119,7 @@ def main() -> None:
     # Flow imbalance
     if flow_imb is not None:
         ax = axes[ax_idx]
-        ax.plot(df.index, flow_imb, color="tab:green", label="15m CVD (perp)")
+        ax.plot(df.index, flow_imb, color="tab:green", label="15m CVD (perp)", rasterized=True)
         ax.set_ylabel("Flow (qty)")
         ax.legend(loc="upper left")
         ax.grid(True, alpha=0.3)
@@ -121,8 +128,9 @@ def main() -> None:
     # Shade data_ok=False regions
     if "data_ok" in df.columns:
         mask = df["data_ok"].fillna(False).astype(bool)
+        ranges = _false_ranges(mask)
         for ax in axes:
-            for s, e in _false_ranges(mask):
+            for s, e in ranges:
                 ax.axvspan(s, e, color="red", alpha=0.1)
 
     fig.suptitle(f"{sym} minute bars")
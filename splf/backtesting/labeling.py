@@ -1,10 +1,121 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange  # type: ignore
+    _HAS_NUMBA = True
+except Exception:  # pragma: no cover
+    _HAS_NUMBA = False
+
+HIST_MINUTES = 30 * 24 * 60  # percentile lookback (30d of 1m bars)
+BASE_WINDOW = 60  # 60m abs move proxy
+
+
+def ts_to_i8(ts) -> np.ndarray:
+    """int64 ns since epoch (UTC) for a DatetimeIndex/Series/array, whatever its unit or tz."""
+    return pd.DatetimeIndex(ts).values.astype("datetime64[ns]").view(np.int64)
+
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, cache=True)
+    def _window_quantiles_nb(arr, ends, window, qs):  # pragma: no cover - compiled
+        # Linear-interpolated quantiles (NaN skipped) of arr[max(0, e - window) : e] for each e in ends;
+        # one O(window) np.partition per end instead of a rolling pass over the whole series.
+        n = ends.shape[0]
+        nq = qs.shape[0]
+        out = np.full((n, nq), np.nan)
+        for i in prange(n):
+            e = ends[i]
+            s = max(0, e - window)
+            buf = np.empty(max(e - s, 0))
+            m = 0
+            for k in range(s, e):
+                x = arr[k]
+                if not np.isnan(x):
+                    buf[m] = x
+                    m += 1
+            if m == 0:
+                continue
+            buf = buf[:m]
+            kth = np.empty(2 * nq, np.int64)
+            for j in range(nq):
+                lo = int(np.floor(qs[j] * (m - 1)))
+                kth[2 * j] = lo
+                kth[2 * j + 1] = min(lo + 1, m - 1)
+            part = np.partition(buf, kth)
+            for j in range(nq):
+                lo = kth[2 * j]
+                hi = kth[2 * j + 1]
+                out[i, j] = part[lo] + (part[hi] - part[lo]) * (qs[j] * (m - 1) - lo)
+        return out
+
+
+def _window_quantiles(base: np.ndarray, ends: np.ndarray, window: int, qs: Sequence[float]) -> np.ndarray:
+    """Quantiles of base over the `window` bars before each end (exclusive); shape (len(ends), len(qs))."""
+    qs_arr = np.asarray(qs, dtype=np.float64)
+    # Per-end selection costs ~len(ends)*window; a rolling skiplist pass costs ~len(base)*log(window)
+    if _HAS_NUMBA and len(ends) * window <= 100 * len(base):
+        return _window_quantiles_nb(base, ends.astype(np.int64), int(window), qs_arr)
+    roll = pd.Series(base).rolling(window, min_periods=1)
+    out = np.full((len(ends), len(qs_arr)), np.nan)
+    valid = ends > 0
+    for j, q in enumerate(qs_arr):
+        out[valid, j] = roll.quantile(q).to_numpy()[ends[valid] - 1]
+    return out
+
+
+def explosion_labels_np(
+    idx_i8: np.ndarray, prices: np.ndarray, alerts_ts_i8: np.ndarray, horizons_min: Sequence[int]
+) -> Dict[str, np.ndarray]:
+    """
+    Array core of compute_explosion_labels.
+
+    idx_i8: sorted minute timestamps (int64 ns) of the price series; prices: float values aligned
+    with idx_i8 (NaN-free); alerts_ts_i8: alert timestamps (int64 ns). Returns one boolean array per
+    `explosion_{T}m_p{80,90}` column, aligned with alerts_ts_i8.
+
+    Vectorized over alerts: the p80/p90 of each 30d history come from _window_quantiles (numba
+    per-alert selection when alerts are sparse, else one rolling quantile over the whole series);
+    the 60m base and the forward moves are differences of one abs-return prefix sum, the latter at
+    searchsorted positions.
+    """
+    n_alerts = len(alerts_ts_i8)
+    horizons = np.asarray(horizons_min, dtype=np.int64)
+    out = {f"explosion_{T}m_p{p}": np.zeros(n_alerts, dtype=np.bool_) for T in horizons for p in (80, 90)}
+    if n_alerts == 0 or len(prices) == 0:
+        return out
+
+    n = len(prices)
+    abs_ret = np.empty(n, dtype=np.float64)
+    abs_ret[0] = np.nan
+    abs_ret[1:] = np.abs(np.diff(np.log(prices)))
+    # One prefix sum serves both the 60m base and the forward moves: sum(abs_ret[a:b]) = csum[b] - csum[a]
+    csum = np.concatenate(([0.0], np.cumsum(np.nan_to_num(abs_ret, nan=0.0))))
+    # 60m rolling abs-sum (NaN until 60 returns exist); the 30d history ending at bar k-1 covers
+    # base[k - 30d + 59 : k]
+    base = np.full(n, np.nan)
+    if n > BASE_WINDOW:
+        base[BASE_WINDOW:] = csum[BASE_WINDOW + 1 :] - csum[1 : n - BASE_WINDOW + 1]
+
+    # History ends at t0 inclusive; forward segments are [t0, t0 + T] inclusive
+    hist_end = np.searchsorted(idx_i8, alerts_ts_i8, side="right")
+    pq = _window_quantiles(base, hist_end, HIST_MINUTES - BASE_WINDOW + 1, (0.8, 0.9))
+    p80, p90 = pq[:, 0], pq[:, 1]
+
+    fwd_start = np.searchsorted(idx_i8, alerts_ts_i8, side="left")
+    for T in horizons:
+        fwd_end = np.searchsorted(idx_i8, alerts_ts_i8 + int(T) * 60_000_000_000, side="right")
+        move = csum[fwd_end] - csum[fwd_start]
+        # NaN percentile (no history yet) compares False
+        out[f"explosion_{T}m_p80"] = move >= p80
+        out[f"explosion_{T}m_p90"] = move >= p90
+    return out
+
 
 def compute_explosion_labels(price_1m: pd.Series, alerts: pd.DataFrame, horizons_min: List[int]) -> pd.DataFrame:
     """
@@ -12,23 +123,20 @@ def compute_explosion_labels(price_1m: pd.Series, alerts: pd.DataFrame, horizons
     Uses absolute return over horizon as proxy for explosion; percentile estimated from rolling 30d history.
     """
     price = price_1m.ffill().dropna()
-    ret1m = np.log(price).diff()
-
-    rows = []
-    for _, a in alerts.iterrows():
-        t0 = a["ts"]
-        # compute percentiles using a 30d window up to t0
-        hist = ret1m.loc[:t0].iloc[-(30 * 24 * 60) :]
-        base = hist.abs().rolling(60).sum()  # 60m abs move proxy
-        p80 = base.quantile(0.8)
-        p90 = base.quantile(0.9)
-
-        row = {"ts": t0, "symbol": a["symbol"], "leader_state": a.get("leader_state", "")}
-        for T in horizons_min:
-            seg = ret1m.loc[t0 : t0 + pd.Timedelta(minutes=T)]
-            move = seg.abs().sum()
-            row[f"explosion_{T}m_p80"] = bool(move >= p80) if not np.isnan(p80) else False
-            row[f"explosion_{T}m_p90"] = bool(move >= p90) if not np.isnan(p90) else False
-        rows.append(row)
-    return pd.DataFrame(rows)
+    labels = explosion_labels_np(
+        ts_to_i8(price.index),
+        price.to_numpy(dtype=np.float64, copy=False),
+        ts_to_i8(alerts["ts"]),
+        np.asarray(horizons_min, dtype=np.int32),
+    )
+    return labels_frame(alerts, labels)
+
 
+def labels_frame(alerts: pd.DataFrame, labels: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Assemble the outcomes frame (ts, symbol, leader_state, label columns) once from label arrays."""
+    cols = {"ts": alerts["ts"].reset_index(drop=True), "symbol": alerts["symbol"].reset_index(drop=True)}
+    if "leader_state" in alerts:
+        cols["leader_state"] = alerts["leader_state"].reset_index(drop=True)
+    else:
+        cols["leader_state"] = pd.Series("", index=cols["ts"].index, dtype=object)
+    return pd.DataFrame({**cols, **labels})
@@ -6,28 +6,43 @@ import numpy as np
 import pandas as pd
 
 
-def precision_recall(labels: pd.Series, preds: pd.Series) -> Dict[str, float]:
-    tp = int(((preds == 1) & (labels == 1)).sum())
-    fp = int(((preds == 1) & (labels == 0)).sum())
-    fn = int(((preds == 0) & (labels == 1)).sum())
+def precision_recall_from_counts(tp: int, fp: int, fn: int) -> Dict[str, float]:
     precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
     recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
     f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
     return {"precision": precision, "recall": recall, "f1": f1, "tp": tp, "fp": fp, "fn": fn}
 
 
+def precision_recall(labels: pd.Series, preds: pd.Series) -> Dict[str, float]:
+    """Binary precision/recall/F1 for 0/1 labels and predictions (missing labels count as 0)."""
+    y = labels.to_numpy(dtype=np.int8, na_value=0)
+    p = preds.to_numpy(dtype=np.int8, na_value=0)
+    # 2x2 confusion in one pass: cell = 2*label + pred -> (tn, fp, fn, tp)
+    cm = np.bincount((y << 1) | p, minlength=4)
+    return precision_recall_from_counts(int(cm[3]), int(cm[1]), int(cm[2]))
+
+
 def compute_metrics(alerts: pd.DataFrame, outcomes: pd.DataFrame, horizons_min: List[int]) -> Dict[str, Dict[str, float]]:
-    # Merge on ts & symbol
-    df = alerts.merge(outcomes, on=["ts", "symbol"], how="left")
+    """Per-(horizon, percentile) precision/recall of the alerts against their explosion labels.
+
+    Every alert is a positive prediction, so the confusion reduces to counting true labels among
+    the alerts: tp = labelled alerts, fp = the rest, fn = 0. Outcomes are aligned to the alerts'
+    (ts, symbol) keys by index lookup instead of a merge; alerts without an outcome count as 0.
+    """
+    keys = ["ts", "symbol"]
+    alert_keys = pd.MultiIndex.from_frame(alerts[keys])
+    labels = outcomes.set_index(keys)
+    if not labels.index.is_unique:
+        raise ValueError("Outcomes contain duplicate (ts, symbol) keys; the join would duplicate alerts")
+    if not labels.index.equals(alert_keys):
+        labels = labels.reindex(alert_keys)
+    n = len(alert_keys)
     metrics: Dict[str, Dict[str, float]] = {}
-    df["alert"] = 1
     for T in horizons_min:
         for p in (80, 90):
             col = f"explosion_{T}m_p{p}"
-            if col not in df.columns:
+            if col not in labels.columns:
                 continue
-            y_true = df[col].fillna(False).astype(int)
-            y_pred = df["alert"].astype(int)
-            metrics[f"T{T}_p{p}"] = precision_recall(y_true, y_pred)
+            tp = int(labels[col].to_numpy(dtype=np.int8, na_value=0).sum())
+            metrics[f"T{T}_p{p}"] = precision_recall_from_counts(tp, n - tp, 0)
     return metrics
-
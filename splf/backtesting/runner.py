@@ -1,12 +1,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 
-from ..modeling.isolation_forest import IFModel
+from ..modeling.isolation_forest import FEATURE_COLUMNS_DEFAULT, IFModel
+
+try:
+    from numba import njit, prange  # type: ignore
+    _HAS_NUMBA = True
+except Exception:  # pragma: no cover
+    _HAS_NUMBA = False
+
+# Columns run_walk_forward reads: only the 1m index is used, the 5m frame feeds the model and leader vote
+MIN_COLS: List[str] = []
+LEADER_STATE_COLUMNS = [
+    "basis_now",
+    "premium_TWAP_60m",
+    "premium_TWAP_120m",
+    "cvd_spot_15m",
+    "cvd_perp_15m",
+    "dperp_share_60m",
+]
+FEAT_COLS = list(dict.fromkeys(FEATURE_COLUMNS_DEFAULT + LEADER_STATE_COLUMNS))
 
 
 @dataclass
@@ -21,7 +39,13 @@ class BacktestConfig:
 
 
 def rolling_windows(df_5m: pd.DataFrame, cfg: BacktestConfig):
-    step = f"{cfg.retrain_every_hours}H"
+    """Yield (train, score) slices: train (cur - train_window, cur], score (cur, cur + step].
+
+    The index is sorted, so each boundary is one binary search and each slice a positional
+    iloc view, instead of two full boolean masks per window.
+    """
+    if not df_5m.index.is_monotonic_increasing:
+        df_5m = df_5m.sort_index()
     idx = df_5m.index
     if len(idx) == 0:
         return
@@ -29,22 +53,26 @@ def rolling_windows(df_5m: pd.DataFrame, cfg: BacktestConfig):
     end = idx[-1]
     cur = start
     one_day = pd.Timedelta(days=cfg.train_window_days)
+    step = pd.Timedelta(hours=cfg.retrain_every_hours)
     while cur <= end:
         train_end = cur
         train_start = train_end - one_day
-        score_end = cur + pd.Timedelta(hours=cfg.retrain_every_hours)
-        train_slice = df_5m[(df_5m.index > train_start) & (df_5m.index <= train_end)]
-        score_slice = df_5m[(df_5m.index > train_end) & (df_5m.index <= score_end)]
-        if not train_slice.empty and not score_slice.empty:
-            yield train_slice, score_slice
+        score_end = cur + step
+        i0, i1, i2 = idx.searchsorted([train_start, train_end, score_end], side="right")
+        if i0 < i1 < i2:
+            yield df_5m.iloc[i0:i1], df_5m.iloc[i1:i2]
         cur = score_end
 
 
-def threshold_from_scores(scores: pd.Series, days: int = 14, q: float = 0.98) -> float:
-    if scores.empty:
+BARS_PER_DAY_5M = 24 * 12
+
+
+def threshold_from_scores(scores: Union[pd.Series, np.ndarray], days: int = 14, q: float = 0.98) -> float:
+    # np.quantile selects with np.partition (O(N)), no full sort
+    arr = np.asarray(scores, dtype=np.float64)
+    if arr.size == 0:
         return float("nan")
-    recent = scores.iloc[-(days * 24 * 12) :]  # 14 days at 5m bars
-    return float(np.quantile(recent.values, q))
+    return float(np.quantile(arr[-(days * BARS_PER_DAY_5M) :], q))  # last `days` of 5m bars
 
 
 def derive_leader_state(row: pd.Series) -> str:
@@ -78,21 +106,85 @@ def derive_leader_state(row: pd.Series) -> str:
         return "confluence"
 
 
+def _vote(x: Optional[np.ndarray], n: int) -> np.ndarray:
+    # +1 where x > 0, -1 where x <= 0, 0 where x is NaN (or its inputs are missing)
+    if x is None:
+        return np.zeros(n, dtype=np.int8)
+    return np.where(np.isnan(x), 0, np.where(x > 0, 1, -1)).astype(np.int8)
+
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, cache=True)
+    def _leader_state_votes_nb(basis, prem120, prem60, cvd_s, cvd_p, dshare):  # pragma: no cover - compiled
+        # The four derive_leader_state votes per row in one pass (NaN input -> no vote)
+        n = basis.shape[0]
+        out = np.zeros(n, np.int8)
+        for i in prange(n):
+            v = 0
+            x = basis[i]
+            if not np.isnan(x):
+                v += 1 if x > 0 else -1
+            x = prem120[i] - prem60[i]
+            if not np.isnan(x):
+                v += 1 if x > 0 else -1
+            x = cvd_s[i] - cvd_p[i]
+            if not np.isnan(x):
+                v += -1 if x > 0 else 1
+            x = dshare[i]
+            if not np.isnan(x):
+                v += 1 if x > 0 else -1
+            out[i] = v
+        return out
+
+
+def derive_leader_state_vec(df: pd.DataFrame) -> np.ndarray:
+    """Column-wise derive_leader_state: the same four votes for every row at once."""
+
+    def col(name: str) -> Optional[np.ndarray]:
+        return df[name].to_numpy(dtype=np.float64, na_value=np.nan) if name in df.columns else None
+
+    def diff(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        return None if a is None or b is None else a - b
+
+    n = len(df)
+    if _HAS_NUMBA:
+        # One fused pass instead of a numpy temporary per vote; a missing column never votes
+        missing = np.full(n, np.nan)
+        args = ["basis_now", "premium_TWAP_120m", "premium_TWAP_60m", "cvd_spot_15m", "cvd_perp_15m", "dperp_share_60m"]
+        votes = _leader_state_votes_nb(*[c if c is not None else missing for c in map(col, args)])
+    else:
+        votes = (
+            _vote(col("basis_now"), n)
+            + _vote(diff(col("premium_TWAP_120m"), col("premium_TWAP_60m")), n)
+            # spot-led flow votes against perp
+            - _vote(diff(col("cvd_spot_15m"), col("cvd_perp_15m")), n)
+            + _vote(col("dperp_share_60m"), n)
+        )
+    return np.select(
+        [votes >= 2, votes <= -2, np.abs(votes) == 1],
+        ["perp-led", "spot-led", "divergence"],
+        default="confluence",
+    ).astype(object)
+
+
 def run_walk_forward(df_1m: pd.DataFrame, df_5m: pd.DataFrame, symbol: str, cfg: BacktestConfig) -> pd.DataFrame:
     # Fit on 5m bars, score 5m bars, then propagate to 1m grid
     model = IFModel(backend=cfg.model_backend)
     scores_5m = []
-    train_hist_scores = []
+    # Only the last 14 days of train scores feed the threshold: keep a bounded tail instead of
+    # every window's scores
+    hist_days = 14
+    hist_cap = hist_days * BARS_PER_DAY_5M
+    train_tail = np.empty(0, dtype=np.float64)
     for train, score in rolling_windows(df_5m, cfg):
-        model.fit(train)
-        s_train = model.score(train)
-        train_hist_scores.append(s_train)
+        s_train = model.fit_score(train)
+        train_tail = np.concatenate((train_tail, s_train.to_numpy(dtype=np.float64)))[-hist_cap:]
         s = model.score(score)
         s.name = "if_score"
         s_df = s.to_frame()
         # leader/state at 5m resolution
-        ls = score.apply(derive_leader_state, axis=1)
-        s_df["leader_state"] = ls.values
+        s_df["leader_state"] = derive_leader_state_vec(score)
         scores_5m.append(s_df)
 
     if not scores_5m:
@@ -100,32 +192,31 @@ def run_walk_forward(df_1m: pd.DataFrame, df_5m: pd.DataFrame, symbol: str, cfg:
 
     scores_5m = pd.concat(scores_5m).sort_index()
     # Threshold from recent scores
-    hist = pd.concat(train_hist_scores) if train_hist_scores else pd.Series(dtype=float)
-    thr = threshold_from_scores(hist, days=14, q=cfg.score_qtile)
+    thr = threshold_from_scores(train_tail, days=hist_days, q=cfg.score_qtile)
     scores_5m["threshold"] = thr
     scores_5m["storm_raw"] = scores_5m["if_score"] >= thr
 
-    # Map 5m scores to 1m by forward-fill
-    aligned = df_1m.join(scores_5m[["if_score", "threshold", "storm_raw", "leader_state"]].resample("1T").ffill(), how="left")
+    # Map 5m scores to 1m by forward-fill: each minute up to the last 5m bar takes the latest bar at
+    # or before it (as resample("1T").ffill() did), reindexed straight onto the 1m index rather
+    # than through a resampled 1m copy of the scores
+    s5 = scores_5m[["if_score", "threshold", "storm_raw", "leader_state"]]
+    covered = df_1m.index[df_1m.index <= s5.index[-1]]
+    aligned = df_1m.join(s5.reindex(covered, method="ffill"), how="left")
     aligned["storm_raw"] = aligned["storm_raw"].fillna(False)
 
     # Persistence logic: pre-alert requires consecutive 1m >= thr
     above = aligned["if_score"] >= aligned["threshold"]
-    pre = above.rolling(cfg.prealert_consecutive_mins, min_periods=cfg.prealert_consecutive_mins).apply(lambda x: 1.0 if x.all() else 0.0)
-    aligned["pre_alert"] = pre == 1.0
-
-    # Confirm after N closed 5m bars still above
-    # Create 5m bar closes
-    closes_5m = aligned.index.floor("5T").to_series().shift() != aligned.index.floor("5T").to_series()
-    bar_close_idx = aligned.index[closes_5m.fillna(False)]
-
-    confirm = pd.Series(False, index=aligned.index)
-    pre_idx = aligned.index[aligned["pre_alert"].fillna(False)]
-    for t0 in pre_idx:
-        t_confirm = t0 + pd.Timedelta(minutes=5 * cfg.confirm_bars_5m)
-        if t_confirm in aligned.index:
-            confirm.loc[t_confirm] = above.loc[t_confirm]
-    aligned["storm"] = confirm
+    # All of the last K minutes above <=> their count is K (native rolling sum, no per-window callback)
+    k = cfg.prealert_consecutive_mins
+    pre = above.fillna(False).astype(np.int8).rolling(k, min_periods=k).sum()
+    aligned["pre_alert"] = (pre == k).to_numpy()
+
+    # Confirm after N closed 5m bars still above: a minute confirms when the minute 5*N earlier
+    # was a pre-alert (one time-shift of the pre-alert mask instead of a loop over pre-alerts)
+    shift_min = 5 * cfg.confirm_bars_5m
+    pre_shifted = aligned["pre_alert"].fillna(False).shift(shift_min, freq="min")
+    confirm = pre_shifted.reindex(aligned.index, fill_value=False).astype(bool) & above.fillna(False)
+    aligned["storm"] = confirm.to_numpy()
 
     # Build alerts
     alerts = aligned.loc[aligned["storm"].fillna(False), ["if_score", "threshold", "leader_state"]].copy()
@@ -0,0 +1,28 @@
+"""Pipeline entry points. Each module exposes ``main(argv=None)``; ``python -m splf.cli`` dispatches them."""
+
+# subcommand → module under splf.cli (imported lazily so a command only pays for its own imports)
+COMMANDS = {
+    "download": "download_data",
+    "ingest-binance": "ingest_binance",
+    "build-minute": "build_minute_bars",
+    "compute-features": "compute_features",
+    "backtest": "run_backtest",
+    "analyze": "analyze_results",
+}
+
+# Stages run by `pipeline`, in order, all with the same --config
+PIPELINE = ["build-minute", "compute-features", "backtest", "analyze"]
+
+
+
+def report_status(sym: str, msg: str, status: str, no_data: str = "Skip: {msg}") -> None:
+    """Print one per-symbol result line; ``no_data`` is formatted with ``msg``."""
+    if status == "ok":
+        print(f"[{sym}] Saved {msg}")
+    elif status == "no_data":
+        print(f"[{sym}] " + no_data.format(msg=msg))
+    else:
+        print(f"[{sym}] Error: {msg}")
+
+
+__all__ = ["COMMANDS", "PIPELINE", "report_status"]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+from typing import List, Optional
+
+from . import COMMANDS, PIPELINE
+
+
+def _run(command: str, argv: List[str]) -> None:
+    module = importlib.import_module(f".{COMMANDS[command]}", __package__)
+    module.main(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="python -m splf.cli",
+        description="Run SPLF pipeline stages in one interpreter (imports and config cache shared across stages)",
+    )
+    ap.add_argument("command", choices=sorted(COMMANDS) + ["pipeline"])
+    ap.add_argument("args", nargs=argparse.REMAINDER, help="Arguments forwarded to the subcommand")
+    ns = ap.parse_args(argv)
+    if ns.command == "pipeline":
+        # e.g. `python -m splf.cli pipeline --config config/config.yaml`
+        pp = argparse.ArgumentParser(prog="python -m splf.cli pipeline")
+        pp.add_argument("--config", required=True)
+        pp.add_argument("--emit-csv", action="store_true", help="Forwarded to analyze")
+        pns = pp.parse_args(ns.args)
+        for stage in PIPELINE:
+            print(f"=== {stage}")
+            stage_argv = ["--config", pns.config]
+            if stage == "analyze" and pns.emit_csv:
+                stage_argv.append("--emit-csv")
+            _run(stage, stage_argv)
+    else:
+        _run(ns.command, ns.args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..backtesting.labeling import explosion_labels_np, labels_frame, ts_to_i8
+from ..backtesting.metrics import compute_metrics
+from ..utils.io import (
+    PARQUET_WRITE_OPTIONS,
+    concat_tables,
+    ensure_dir,
+    load_yaml,
+    read_alerts,
+    resolve_symbols,
+    save_json,
+    scan_alerts,
+    scan_subdirs,
+)
+
+
+def _left_join(alerts_tbl: pa.Table, outcomes_tbl: pa.Table) -> pa.Table:
+    """Arrow (multi-threaded hash) left join on (ts, symbol), alert order kept like DataFrame.merge."""
+    keys = ["ts", "symbol"]
+    if outcomes_tbl.group_by(keys).aggregate([]).num_rows != outcomes_tbl.num_rows:
+        raise ValueError("Outcomes contain duplicate (ts, symbol) keys; the join would duplicate alerts")
+    left = alerts_tbl.append_column("_row", pa.array(np.arange(alerts_tbl.num_rows, dtype=np.int64)))
+    merged = left.join(outcomes_tbl, keys=keys, join_type="left outer", left_suffix="_x", right_suffix="_y")
+    merged = merged.sort_by("_row")
+    return merged.select([c for c in merged.column_names if c != "_row"])
+
+
+class _TableSink:
+    """Append per-symbol tables to one Parquet file (and optionally a CSV) without concatenating them.
+
+    The writer is opened lazily from the first table's schema; later tables are cast to it so
+    symbols whose columns were inferred differently (e.g. an all-null column) still line up.
+    """
+
+    def __init__(self, path: Path, csv_path: Optional[Path] = None):
+        self.path = path
+        self.csv_path = csv_path
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    def write(self, tbl: pa.Table) -> None:
+        first = self._writer is None
+        if first:
+            self._writer = pq.ParquetWriter(
+                self.path,
+                tbl.schema,
+                compression=PARQUET_WRITE_OPTIONS["compression"],
+                compression_level=PARQUET_WRITE_OPTIONS["compression_level"],
+                write_statistics=PARQUET_WRITE_OPTIONS["write_statistics"],
+                data_page_size=1 << 20,
+            )
+        elif not tbl.schema.equals(self._writer.schema):
+            tbl = tbl.select(self._writer.schema.names).cast(self._writer.schema)
+        self._writer.write_table(tbl, row_group_size=PARQUET_WRITE_OPTIONS["row_group_size"])
+        if self.csv_path is not None:
+            tbl.to_pandas().to_csv(self.csv_path, index=False, mode="w" if first else "a", header=first)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    ap.add_argument("--emit-csv", action="store_true", help="Also write CSV copies of the concatenated results")
+    args = ap.parse_args(argv)
+
+    cfg = load_yaml(args.config)
+    paths = cfg["paths"]
+    symbols = resolve_symbols(cfg)
+    horizons = cfg.get("backtest", {}).get("horizons_min", [30, 60, 90, 120])
+    horizons_arr = np.asarray(horizons, dtype=np.int32)
+
+    out_dir = ensure_dir(Path(paths["artifacts_dir"]) / "metrics")
+    names = ("alerts_all", "outcomes_all", "alert_outcomes")
+    sinks = [_TableSink(out_dir / f"{n}.parquet", (out_dir / f"{n}.csv") if args.emit_csv else None) for n in names]
+    # Results are streamed to disk per symbol; only the (ts, symbol) keys and labels are kept for metrics
+    key_tables: list[pa.Table] = []
+    outcomes_tables: list[pa.Table] = []
+    # One listing per directory instead of per-symbol existence checks
+    alert_files = scan_alerts(Path(paths["artifacts_dir"]) / "alerts")
+    minute_syms = scan_subdirs(paths["processed_dir"])
+    try:
+        for sym in symbols:
+            p_alerts = alert_files.get(sym)
+            p_min = Path(paths["processed_dir"]) / sym / "minute.parquet"
+            if p_alerts is None or sym not in minute_syms:
+                print(f"Skip {sym}: missing alerts or minute data")
+                continue
+            alerts = read_alerts(p_alerts)
+            if alerts.empty:
+                continue
+            try:
+                price_1m = pd.read_parquet(p_min, columns=["perp_mark"])["perp_mark"].ffill().bfill().dropna()
+            except FileNotFoundError:
+                print(f"Skip {sym}: missing alerts or minute data")
+                continue
+            # Hand the labeler plain arrays: i8 minute index, float prices, i8 alert times
+            labels = explosion_labels_np(
+                ts_to_i8(price_1m.index),
+                price_1m.to_numpy(dtype=np.float64, copy=False),
+                ts_to_i8(alerts["ts"]),
+                horizons_arr,
+            )
+            outcomes = labels_frame(alerts, labels)
+            alerts_tbl = pa.Table.from_pandas(alerts, preserve_index=False)
+            outcomes_tbl = pa.Table.from_pandas(outcomes, preserve_index=False)
+            for sink, tbl in zip(sinks, (alerts_tbl, outcomes_tbl, _left_join(alerts_tbl, outcomes_tbl))):
+                sink.write(tbl)
+            key_tables.append(alerts_tbl.select(["ts", "symbol"]))
+            outcomes_tables.append(outcomes_tbl)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    if not key_tables:
+        print("No alerts found")
+        return
+
+    metrics = compute_metrics(concat_tables(key_tables).to_pandas(), concat_tables(outcomes_tables).to_pandas(), horizons)
+    # Save metrics
+    save_json(out_dir / "metrics.json", metrics)
+    print(f"Saved metrics to {out_dir / 'metrics.json'} and full results to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
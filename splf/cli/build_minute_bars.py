@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from concurrent.futures import Executor
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from . import report_status
+from ..data_handler.minute_builder import build_minute_frame, save_minute_parquet
+from ..runtime.pool import get_pool, init_worker, start_log_listener, worker_config
+from ..utils.io import resolve_symbols, resolve_workers
+
+
+def _log_level() -> int:
+    # Per-day/read details are DEBUG and only emitted with SPLF_DEBUG=1
+    return logging.DEBUG if os.environ.get("SPLF_DEBUG", "").lower() in ("1", "true", "yes") else logging.INFO
+
+
+def _log_handlers() -> List[logging.Handler]:
+    """debug.log only (stdout gets the per-symbol report lines); attached to the single queue listener, its only writer."""
+    log_path = Path(__file__).resolve().parents[2] / "debug.log"
+    fmt = logging.Formatter("%(asctime)s %(levelname)s pid=%(process)d %(name)s: %(message)s")
+    handlers: List[logging.Handler] = [logging.FileHandler(log_path, mode="a")]
+    for h in handlers:
+        h.setFormatter(fmt)
+    return handlers
+
+
+def _setup_logging() -> None:
+    """Send this process's records to the queue listener; pool workers are wired by get_pool."""
+    log_queue = start_log_listener(_log_handlers)
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.setLevel(_log_level())
+    root.addHandler(QueueHandler(log_queue))
+
+
+def _day_cache_dir(cfg, sym: str) -> Optional[Path]:
+    # Per-day bars are reused across runs unless runtime.force is set
+    if cfg.get("runtime", {}).get("force", False):
+        return None
+    return Path(cfg["paths"]["processed_dir"]) / sym / "minute_cache"
+
+
+def _build_one(sym: str, executor: Optional[Executor] = None):
+    cfg = worker_config()
+    paths = cfg["paths"]
+    period = cfg["period"]
+    include_spot = cfg.get("datasets", {}).get("spot_aggTrades", False)
+    spot_for = set(cfg.get("features", {}).get("spot_for", []))
+    logger = logging.getLogger("build_minute_bars")
+    try:
+        logger.info(
+            f"build_start symbol={sym} raw_dir={paths.get('raw_dir')} start={period.get('start')} end={period.get('end')} include_spot={include_spot and (sym in spot_for)}"
+        )
+        df = build_minute_frame(
+            paths["raw_dir"],
+            sym,
+            period["start"],
+            period["end"],
+            include_spot=include_spot and (sym in spot_for),
+            ingest_dir=paths.get("ingest_dir"),
+            executor=executor,
+            cache_dir=_day_cache_dir(cfg, sym),
+        )
+        if df.empty:
+            logger.warning(f"no_data symbol={sym}")
+            return sym, "", "no_data"
+        out = save_minute_parquet(df, paths["processed_dir"], sym)
+        logger.info(f"saved symbol={sym} path={out} shape={df.shape} columns={list(df.columns)}")
+        return sym, str(out), "ok"
+    except Exception as e:
+        logger.exception(f"build_failed symbol={sym} error={e}")
+        return sym, str(e), "error"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    args = ap.parse_args(argv)
+
+    _setup_logging()
+    init_worker(args.config)
+    cfg = worker_config()
+    symbols = resolve_symbols(cfg)
+
+    workers = resolve_workers(cfg, len(symbols))
+    print(f"Building 1m for {len(symbols)} symbols with {workers} workers…")
+    if workers > 1 and len(symbols) > 1:
+        ex = get_pool(workers, args.config)
+        # Batch symbols per IPC round-trip; results stream back in symbol order
+        chunk = max(1, len(symbols) // (4 * workers))
+        for sym, msg, status in ex.map(_build_one, symbols, chunksize=chunk):
+            report_status(sym, msg, status, no_data="No data")
+    else:
+        # Symbols run one after another: spread each symbol's days over the pool instead
+        n_days = len(pd.date_range(cfg["period"]["start"], cfg["period"]["end"], freq="D"))
+        day_workers = resolve_workers(cfg, n_days)
+        ex = get_pool(day_workers, args.config) if day_workers > 1 and n_days > 1 else None
+        for sym in symbols:
+            print(f"Building 1m for {sym}…")
+            sym, msg, status = _build_one(sym, executor=ex)
+            report_status(sym, msg, status, no_data="No data")
+
+
+if __name__ == "__main__":
+    main()
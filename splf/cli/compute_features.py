@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from . import report_status
+from ..feature_engine.features import MINUTE_INPUT_COLUMNS, compute_features_1m, resample_to_5m, save_features_parquet
+from ..runtime.pool import get_pool, init_worker, worker_config
+from ..utils.io import read_parquet_subset, resolve_symbols, resolve_workers
+
+
+def _compute_one(sym: str):
+    # Config is loaded once per process by the pool initializer instead of pickled per task
+    cfg = worker_config()
+    paths = cfg["paths"]
+    try:
+        p = Path(paths["processed_dir"]) / sym / "minute.parquet"
+        if not p.exists():
+            return sym, f"Missing {p}", "no_data"
+        cols = cfg.get("features", {}).get("input_columns") or MINUTE_INPUT_COLUMNS
+        df_1m = read_parquet_subset(p, cols)
+        df_feat_1m = compute_features_1m(df_1m, sym, cfg)
+        df_feat_5m = resample_to_5m(df_feat_1m)
+        out = save_features_parquet(df_feat_5m, paths["features_dir"], sym)
+        return sym, str(out), "ok"
+    except Exception as e:
+        return sym, str(e), "error"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    args = ap.parse_args(argv)
+
+    init_worker(args.config)
+    cfg = worker_config()
+    symbols = resolve_symbols(cfg)
+
+    workers = resolve_workers(cfg, len(symbols))
+    print(f"Computing features for {len(symbols)} symbols with {workers} workers…")
+    if workers > 1 and len(symbols) > 1:
+        ex = get_pool(workers, args.config)
+        # Batch symbols per IPC round-trip; results stream back in symbol order
+        chunk = max(1, len(symbols) // (4 * workers))
+        for sym, msg, status in ex.map(_compute_one, symbols, chunksize=chunk):
+            report_status(sym, msg, status)
+    else:
+        for sym in symbols:
+            sym, msg, status = _compute_one(sym)
+            report_status(sym, msg, status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional
+
+from ..data_handler.downloader import BinanceDownloader
+from ..utils.io import available_cpus, load_yaml, resolve_symbols
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    ap.add_argument("--force", action="store_true")
+    args = ap.parse_args(argv)
+
+    cfg = load_yaml(args.config)
+    paths = cfg["paths"]
+    symbols = resolve_symbols(cfg)
+    period = cfg["period"]
+    datasets = [k for k, v in cfg.get("datasets", {}).items() if v]
+
+    # Auto-detect reasonable workers for I/O bound downloads if not specified or set to 0
+    cfg_workers = cfg.get("runtime", {}).get("workers")
+    if cfg_workers in (None, 0, "auto"):
+        workers = max(16, available_cpus())  # threads; latency-bound, not CPU-bound
+    else:
+        workers = int(cfg_workers)
+    dl = BinanceDownloader(paths["raw_dir"], workers=workers)
+    tasks = dl.plan(symbols, period["start"], period["end"], datasets)
+    results = dl.download(tasks, force=args.force or cfg.get("runtime", {}).get("force", False))
+    ok = sum(1 for _, b in results if b)
+    print(f"Downloaded {ok}/{len(results)} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import requests
+
+from ..utils.http import RateLimiter, json_loads, make_session
+from ..utils.io import PARQUET_WRITE_OPTIONS, ensure_dir, load_yaml, resolve_symbols
+
+
+BINANCE_FAPI = "https://fapi.binance.com"
+BINANCE_DATA = "https://fapi.binance.com/futures/data"
+
+# Typed per-page schemas: each JSON page becomes an Arrow table, concatenated once per fetch
+_TS = pa.timestamp("ms", tz="UTC")
+FUNDING_SCHEMA = pa.schema([("ts", _TS), ("funding_now", pa.float64())])
+OI_SCHEMA = pa.schema([("ts", _TS), ("oi", pa.float64())])
+LIQ_SCHEMA = pa.schema([("ts", _TS), ("side", pa.string()), ("price", pa.float64()), ("qty", pa.float64())])
+
+
+def _to_ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _num(v) -> Optional[float]:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _tables_to_frame(tables: List[pa.Table], dropna: List[str]) -> pd.DataFrame:
+    df = pa.concat_tables(tables).to_pandas()
+    df["ts"] = df["ts"].astype("datetime64[ns, UTC]")
+    return df.dropna(subset=dropna).set_index("ts").sort_index()
+
+
+def _daterange(start: str, end: str) -> Tuple[datetime, datetime]:
+    s = datetime.fromisoformat(start).replace(tzinfo=timezone.utc)
+    e = datetime.fromisoformat(end).replace(tzinfo=timezone.utc)
+    return s, e
+
+
+def fetch_funding(
+    symbol: str, s: datetime, e: datetime, session: Optional[requests.Session] = None, limiter: Optional[RateLimiter] = None
+) -> pd.DataFrame:
+    """Fetch funding rate history (8h points) in [s, e] inclusive."""
+    sess = session or requests.Session()
+    limiter = limiter or RateLimiter(rate=5.0)
+    tables: List[pa.Table] = []
+    start = s
+    while start <= e:
+        params = {
+            "symbol": symbol,
+            "startTime": _to_ms(start),
+            "endTime": _to_ms(min(e, start + timedelta(days=14))),
+            "limit": 1000,
+        }
+        limiter.acquire()
+        r = sess.get(f"{BINANCE_FAPI}/fapi/v1/fundingRate", params=params, timeout=20)
+        r.raise_for_status()
+        data = json_loads(r.content)
+        if not data:
+            break
+        tables.append(
+            pa.table(
+                {"ts": [int(r["fundingTime"]) for r in data], "funding_now": [_num(r.get("fundingRate")) for r in data]},
+                schema=FUNDING_SCHEMA,
+            )
+        )
+        last_ms = int(data[-1]["fundingTime"])
+        start = datetime.fromtimestamp(last_ms / 1000.0, tz=timezone.utc) + timedelta(milliseconds=1)
+    if not tables:
+        return pd.DataFrame(columns=["ts", "funding_now"]).set_index(pd.DatetimeIndex([], tz="UTC"))
+    return _tables_to_frame(tables, dropna=["ts"])
+
+
+def fetch_oi(
+    symbol: str, s: datetime, e: datetime, session: Optional[requests.Session] = None, limiter: Optional[RateLimiter] = None
+) -> pd.DataFrame:
+    """Fetch open interest history (5m points) in [s, e]. Shrinks window on HTTP/parse errors."""
+    sess = session or requests.Session()
+    limiter = limiter or RateLimiter(rate=5.0)
+    tables: List[pa.Table] = []
+    start = s
+    window_days = 7
+    while start <= e:
+        endw = min(e, start + timedelta(days=window_days))
+        params = {
+            "symbol": symbol,
+            "period": "5m",
+            "startTime": _to_ms(start),
+            "endTime": _to_ms(endw),
+        }
+        url = f"{BINANCE_DATA}/openInterestHist"
+        limiter.acquire()
+        r = sess.get(url, params=params, timeout=20, headers={"User-Agent": "splf-backtest/1.0"})
+        if r.status_code != 200:
+            print(f"[OI] HTTP {r.status_code} {url} params={params}")
+            if window_days > 1:
+                window_days = max(1, window_days // 2)
+                continue
+            else:
+                break
+        try:
+            data = json_loads(r.content)
+        except Exception:
+            txt = (r.text or "")[:200]
+            print(f"[OI] Non-JSON response ({len(r.text)} bytes): {txt}…")
+            if window_days > 1:
+                window_days = max(1, window_days // 2)
+                continue
+            else:
+                break
+        if not data:
+            start = endw + timedelta(milliseconds=1)
+            continue
+        # Normalize possible field names
+        sample = data[0]
+        oi_col = "sumOpenInterest" if "sumOpenInterest" in sample else ("openInterest" if "openInterest" in sample else None)
+        ts_col = "timestamp" if "timestamp" in sample else "time"
+        if oi_col is not None:
+            tables.append(
+                pa.table({"ts": [r.get(ts_col) for r in data], "oi": [_num(r.get(oi_col)) for r in data]}, schema=OI_SCHEMA)
+            )
+        last_ms = int(data[-1].get("timestamp") or data[-1].get("time") or _to_ms(start))
+        start = datetime.fromtimestamp(last_ms / 1000.0, tz=timezone.utc) + timedelta(milliseconds=1)
+    if not tables:
+        return pd.DataFrame(columns=["ts", "oi"]).set_index(pd.DatetimeIndex([], tz="UTC"))
+    return _tables_to_frame(tables, dropna=["ts"])
+
+
+def fetch_liquidations(
+    symbol: str, s: datetime, e: datetime, session: Optional[requests.Session] = None, limiter: Optional[RateLimiter] = None
+) -> pd.DataFrame:
+    """Fetch liquidation orders in [s, e] and return events with ts, side, price, qty. Shrinks window on HTTP/parse errors."""
+    sess = session or requests.Session()
+    limiter = limiter or RateLimiter(rate=1 / 0.3)
+    tables: List[pa.Table] = []
+    start = s
+    window_hours = 24
+    while start <= e:
+        endw = min(e, start + timedelta(hours=window_hours))
+        params = {
+            "symbol": symbol,
+            "startTime": _to_ms(start),
+            "endTime": _to_ms(endw),
+            "limit": 1000,
+        }
+        url = f"{BINANCE_FAPI}/fapi/v1/allForceOrders"
+        limiter.acquire()
+        r = sess.get(url, params=params, timeout=20, headers={"User-Agent": "splf-backtest/1.0"})
+        if r.status_code != 200:
+            print(f"[LIQ] HTTP {r.status_code} {url} params={params}")
+            if window_hours > 1:
+                window_hours = max(1, window_hours // 2)
+                continue
+            else:
+                break
+        try:
+            data = json_loads(r.content)
+        except Exception:
+            txt = (r.text or "")[:200]
+            print(f"[LIQ] Non-JSON response ({len(r.text)} bytes): {txt}…")
+            if window_hours > 1:
+                window_hours = max(1, window_hours // 2)
+                continue
+            else:
+                break
+        if not data:
+            start = endw + timedelta(milliseconds=1)
+            continue
+        ts_col = "time" if "time" in data[0] else "updateTime"
+        tables.append(
+            pa.table(
+                {
+                    "ts": [r.get(ts_col) for r in data],
+                    "side": [r.get("side") for r in data],
+                    "price": [_num(r.get("price")) for r in data],
+                    "qty": [_num(r.get("origQty")) for r in data],
+                },
+                schema=LIQ_SCHEMA,
+            )
+        )
+        last_ms = int(data[-1].get("time") or data[-1].get("updateTime") or _to_ms(start))
+        start = datetime.fromtimestamp(last_ms / 1000.0, tz=timezone.utc) + timedelta(milliseconds=1)
+    if not tables:
+        return pd.DataFrame(columns=["ts", "side", "price", "qty"]).set_index(pd.DatetimeIndex([], tz="UTC"))
+    return _tables_to_frame(tables, dropna=["ts", "qty"])
+
+
+# kind → (fetcher, output file, unit for logging)
+_FETCHERS = {
+    "funding": (fetch_funding, "funding.parquet", "rows"),
+    "oi": (fetch_oi, "oi.parquet", "rows"),
+    "liquidations": (fetch_liquidations, "liquidations.parquet", "events"),
+}
+
+
+def _ingest_one(sym: str, kind: str, s: datetime, e: datetime, out_dir: Path, sess: requests.Session, limiter: RateLimiter) -> str:
+    fetch, fname, unit = _FETCHERS[kind]
+    df = fetch(sym, s, e, sess, limiter)
+    if df.empty:
+        return f"[{sym}] {kind}: no data"
+    df.to_parquet(out_dir / fname, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
+    return f"[{sym}] {kind}: {len(df)} {unit} → {out_dir / fname}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Ingest Binance REST data for backtesting (funding, OI, liquidations)")
+    ap.add_argument("--config", required=True)
+    ap.add_argument("--symbols", nargs="*", help="Override symbols (default from config)")
+    ap.add_argument("--start", help="Override period.start (YYYY-MM-DD)")
+    ap.add_argument("--end", help="Override period.end (YYYY-MM-DD)")
+    args = ap.parse_args(argv)
+
+    cfg = load_yaml(args.config)
+    paths = cfg["paths"]
+    ingest_dir = Path(paths.get("ingest_dir", "data/ingest-binance"))
+    symbols = args.symbols or resolve_symbols(cfg)
+    per = cfg.get("period", {})
+    s0 = args.start or per.get("start")
+    e0 = args.end or per.get("end")
+    if not (s0 and e0):
+        raise SystemExit("Missing start/end period")
+    s, e = _daterange(s0, e0)
+
+    ingest_cfg = cfg.get("ingest", {})
+    do_funding = ingest_cfg.get("funding", True)
+    do_oi = ingest_cfg.get("open_interest", True)
+    do_liq = ingest_cfg.get("liquidations", True)
+
+    # One keep-alive session (shared pool + retries) and one rate limiter for all tasks
+    workers = int(ingest_cfg.get("workers", 8))
+    sess = make_session(pool_size=max(workers, 1), headers={"User-Agent": "splf-backtest/1.0"})
+    limiter = RateLimiter(rate=float(ingest_cfg.get("max_requests_per_sec", 5.0)))
+    kinds = [k for k, on in (("funding", do_funding), ("oi", do_oi), ("liquidations", do_liq)) if on]
+    print(f"Ingest {len(symbols)} symbols ({', '.join(kinds)}): {s0} → {e0} with {workers} threads")
+    tasks = [(sym, kind) for sym in symbols for kind in kinds]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as ex:
+        futs = {ex.submit(_ingest_one, sym, kind, s, e, ensure_dir(ingest_dir / sym), sess, limiter): (sym, kind) for sym, kind in tasks}
+        for fut in as_completed(futs):
+            sym, kind = futs[fut]
+            try:
+                print(fut.result())
+            except Exception as exc:
+                print(f"[{sym}] {kind}: error {exc}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from concurrent.futures import as_completed
+
+from . import report_status
+from ..backtesting.runner import FEAT_COLS, MIN_COLS, BacktestConfig, run_walk_forward
+from ..runtime.pool import get_pool
+from ..utils.io import load_yaml, read_parquet_subset, resolve_symbols, resolve_workers, write_alerts
+
+
+def _run_one(sym: str, paths: dict, bt_cfg: BacktestConfig):
+    try:
+        p_min = Path(paths["processed_dir"]) / sym / "minute.parquet"
+        p_feat = Path(paths["features_dir"]) / sym / "features_5m.parquet"
+        if not p_min.exists() or not p_feat.exists():
+            return sym, f"Missing inputs: {p_min} or {p_feat}", "no_data"
+        # Project to the columns the walk-forward actually touches
+        df_1m = read_parquet_subset(p_min, MIN_COLS)
+        df_5m = read_parquet_subset(p_feat, FEAT_COLS)
+        alerts = run_walk_forward(df_1m, df_5m, sym, bt_cfg)
+        out = write_alerts(Path(paths["artifacts_dir"]) / "alerts", sym, alerts)
+        return sym, str(out), "ok"
+    except Exception as e:
+        return sym, str(e), "error"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    args = ap.parse_args(argv)
+
+    cfg = load_yaml(args.config)
+    paths = cfg["paths"]
+    symbols = resolve_symbols(cfg)
+
+    bt_cfg = BacktestConfig(
+        train_window_days=cfg.get("backtest", {}).get("train_window_days", 30),
+        retrain_every_hours=cfg.get("backtest", {}).get("retrain_every_hours", 8),
+        score_qtile=float(cfg.get("backtest", {}).get("score_qtile", 0.98)),
+        prealert_consecutive_mins=int(cfg.get("backtest", {}).get("prealert_consecutive_mins", 2)),
+        confirm_bars_5m=int(cfg.get("backtest", {}).get("confirm_bars_5m", 1)),
+        mask_funding_minutes=int(cfg.get("backtest", {}).get("mask_funding_minutes", 10)),
+        model_backend=cfg.get("model", {}).get("backend", "auto"),
+    )
+
+    workers = resolve_workers(cfg, len(symbols))
+    print(f"Backtesting {len(symbols)} symbols with {workers} workers (backend={bt_cfg.model_backend})…")
+    if workers > 1 and len(symbols) > 1:
+        ex = get_pool(workers, args.config)
+        futs = [ex.submit(_run_one, sym, paths, bt_cfg) for sym in symbols]
+        for fut in as_completed(futs):
+            sym, msg, status = fut.result()
+            report_status(sym, msg, status)
+    else:
+        for sym in symbols:
+            sym, msg, status = _run_one(sym, paths, bt_cfg)
+            report_status(sym, msg, status)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,38 +3,103 @@ from __future__ import annotations
 import io
 import os
 import zipfile
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
 import logging
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from dateutil import tz
+from pyarrow import compute as pc
+from pyarrow import csv as pacsv
 
+from ..utils.io import PARQUET_WRITE_OPTIONS
 
-def _read_zip_csv(path: os.PathLike | str, names: Optional[List[str]] = None, dtype=None, usecols=None) -> pd.DataFrame:
+
+MINUTES_PER_DAY = 24 * 60
+
+# Arrow types for the columns read from kline / aggTrades dumps (no per-block type inference).
+# Trade qty is stored as float32 (half the memory traffic per row); the per-minute sums still
+# accumulate in double.
+_KLINE_TYPES = {"open_time": pa.int64(), "close": pa.float64()}
+_AGG_TRADE_TYPES = {"qty": pa.float32(), "ts": pa.int64(), "isBuyerMaker": pa.bool_()}
+
+
+def _has_header(first_line: bytes) -> bool:
+    # Newer Binance dumps start with a header row; data rows always lead with a number
+    try:
+        float(first_line.split(b",", 1)[0])
+        return False
+    except ValueError:
+        return True
+
+
+def _zip_bytes(path: os.PathLike | str) -> Optional[bytes]:
     p = Path(path)
     if not p.exists():
-        return pd.DataFrame()
+        return None
     with zipfile.ZipFile(p, "r") as zf:
         # choose first file
-        fname = zf.namelist()[0]
-        with zf.open(fname) as f:
-            df = pd.read_csv(
-                f,
-                header=None,
-                names=names,
-                dtype=dtype,
-                usecols=usecols,
-                low_memory=False,
-            )
+        return zf.read(zf.namelist()[0])
+
+
+def _csv_table(data: bytes, names: Optional[List[str]] = None, dtype=None, usecols=None) -> Optional[pa.Table]:
+    """Parse Binance CSV bytes with the multi-threaded Arrow parser; None when the file is empty.
+
+    names/usecols follow pd.read_csv(header=None): names label either every column or just the
+    usecols positions. dtype optionally maps column name -> pyarrow type (skips inference). A
+    header row, if present, is skipped. Raises pa.ArrowInvalid on irregular rows.
+    """
+    nl = data.find(b"\n")
+    first = (data if nl < 0 else data[:nl]).rstrip(b"\r")
+    if not first:
+        return None
+    ncols = first.count(b",") + 1
+    positions = list(usecols) if usecols is not None else list(range(ncols))
+    if names is not None and len(names) == len(positions):
+        labels = dict(zip(positions, names))
+    elif names is not None:
+        labels = {i: names[i] for i in positions}
+    else:
+        labels = {i: i for i in positions}
+    file_cols = [str(labels.get(i, f"_c{i}")) for i in range(ncols)]
+    include = [str(labels[i]) for i in positions]
+    # BufferReader: Arrow reads the bytes in place (no Python file object in the parse loop)
+    return pacsv.read_csv(
+        pa.BufferReader(data),
+        read_options=pacsv.ReadOptions(column_names=file_cols, skip_rows=int(_has_header(first)), use_threads=True),
+        convert_options=pacsv.ConvertOptions(include_columns=include, column_types=dtype or {}),
+    )
+
+
+def _read_zip_csv(path: os.PathLike | str, names: Optional[List[str]] = None, dtype=None, usecols=None) -> pd.DataFrame:
+    """Read the first CSV in a zip into pandas (Arrow parser, see _csv_table)."""
+    data = _zip_bytes(path)
+    if data is None:
+        return pd.DataFrame()
+    try:
+        tbl = _csv_table(data, names=names, dtype=dtype, usecols=usecols)
+    except (pa.ArrowInvalid, ValueError):
+        # Irregular rows: fall back to the permissive pandas parser (callers coerce per column)
+        return pd.read_csv(io.BytesIO(data), header=None, names=names, usecols=usecols, low_memory=False)
+    if tbl is None:
+        return pd.DataFrame()
+    # One block per column, freeing each Arrow column as it is converted (lower peak memory)
+    df = tbl.to_pandas(split_blocks=True, self_destruct=True)
+    del tbl
+    if names is None:
+        df.columns = list(usecols) if usecols is not None else list(range(df.shape[1]))
     return df
 
 
-def _to_minute_index(ts_ms: pd.Series) -> pd.DatetimeIndex:
-    return pd.to_datetime(ts_ms, unit="ms", utc=True).dt.floor("min")
+def _to_minute_int(ts_ms: pd.Series) -> np.ndarray:
+    """Epoch-ms timestamps -> int64 epoch ms of their minute (floor); the groupby/join key."""
+    return (ts_ms.to_numpy() // 60_000).astype(np.int64) * 60_000
 
 
 def _safe_float(s: pd.Series) -> pd.Series:
@@ -52,6 +117,15 @@ def _normalize_ts_ms(ts: pd.Series, context: str = "") -> pd.Series:
     med = float(sv.median())
     # typical ms since epoch ~ 1.6e12 in 2020s
     # seconds ~ 1.6e9; microseconds ~ 1.6e15; nanoseconds ~ 1.6e18
+    if pd.api.types.is_integer_dtype(s):
+        # Exact integer floor to ms (no float round-trip of 13+ digit values)
+        if med > 1e17:
+            return s // 1_000_000  # ns → ms
+        if med > 1e14:
+            return s // 1_000  # us → ms
+        if med < 1e11:
+            return s * 1_000  # s → ms
+        return s
     factor = 1.0
     if med > 1e17:
         factor = 1e6  # ns → ms
@@ -65,14 +139,342 @@ def _normalize_ts_ms(ts: pd.Series, context: str = "") -> pd.Series:
 
 
 def _to_int01_isbuyer(s: pd.Series) -> pd.Series:
-    """Robustly convert isBuyerMaker to {0,1} from mixed types (bool/int/str)."""
+    """Robustly convert isBuyerMaker to {0,1} from mixed types (bool/int/str); unparseable -> NaN."""
+    if pd.api.types.is_bool_dtype(s):
+        return s.astype(np.int8)
+    if pd.api.types.is_integer_dtype(s):
+        return s
     out = pd.to_numeric(s, errors="coerce")
-    mask = out.isna()
+    mask = out.isna().to_numpy()
     if mask.any():
-        st = s.astype(str).str.strip().str.lower()
-        mapd = st.map({"true": 1, "false": 0, "1": 1, "0": 0})
-        out = out.where(~mask, mapd)
-    return pd.to_numeric(out, errors="coerce")
+        # String-normalize only the entries that did not parse as numbers (true/false text)
+        st = s[mask].astype(str).str.strip().str.lower()
+        out[mask] = st.map({"true": 1, "false": 0, "1": 1, "0": 0}).to_numpy(dtype=np.float64)
+    return out
+
+
+def _taker_flow(trades: pd.DataFrame, names: tuple) -> pd.DataFrame:
+    """Per-minute taker buy / taker sell / total qty from (minute, qty, isBuyerMaker) trades.
+
+    One groupby over side-split qty columns instead of three filtered passes; a side with no
+    trades in a minute stays NaN (min_count=1), as the per-side groupbys left it.
+    """
+    qty = trades["qty"]
+    seller = trades["isBuyerMaker"].to_numpy() == 1  # buyer is maker -> taker sold
+    sides = pd.DataFrame(
+        {
+            names[0]: qty.where(~seller),
+            names[1]: qty.where(seller),
+            names[2]: qty,
+            "minute": trades["minute"],
+        }
+    )
+    return sides.groupby("minute", sort=False).sum(min_count=1)
+
+
+def _taker_flow_arrow(tbl: pa.Table, names: tuple) -> pd.DataFrame:
+    """_taker_flow on a typed (qty, ts, isBuyerMaker) Arrow table, without leaving Arrow.
+
+    Timestamps are normalized to ms and floored to the minute in int64; the per-minute sums come
+    from Arrow's multi-threaded hash group_by (an all-null side sums to null -> NaN, like
+    min_count=1). Only the ~1440-row result is converted to pandas.
+    """
+    tbl = tbl.drop_null()
+    if tbl.num_rows == 0:
+        return pd.DataFrame()
+    ts = tbl["ts"]
+    # Same magnitude heuristic as _normalize_ts_ms, in integer arithmetic
+    med = float(pc.approximate_median(ts).as_py())
+    if med > 1e17:
+        ts = pc.divide(ts, 1_000_000)  # ns -> ms
+    elif med > 1e14:
+        ts = pc.divide(ts, 1_000)  # us -> ms
+    elif med < 1e11:
+        ts = pc.multiply(ts, 1_000)  # s -> ms
+    qty = tbl["qty"]
+    seller = tbl["isBuyerMaker"]  # buyer is maker -> taker sold
+    none = pa.scalar(None, qty.type)
+    sides = pa.table(
+        {
+            "minute": pc.multiply(pc.divide(ts, 60_000), 60_000),
+            "buy": pc.if_else(seller, none, qty),
+            "sell": pc.if_else(seller, qty, none),
+            "qty": qty,
+        }
+    )
+    agg = sides.group_by("minute").aggregate([("buy", "sum"), ("sell", "sum"), ("qty", "sum")])
+    return pd.DataFrame(
+        {
+            names[0]: agg["buy_sum"].to_numpy(zero_copy_only=False),
+            names[1]: agg["sell_sum"].to_numpy(zero_copy_only=False),
+            names[2]: agg["qty_sum"].to_numpy(zero_copy_only=False),
+        },
+        index=pd.Index(agg["minute"].to_numpy(), name="minute"),
+    )
+
+
+def _agg_trades_flow(path: os.PathLike | str, names: tuple, context: str = "") -> pd.DataFrame:
+    """Per-minute taker flow for one aggTrades zip: [id, price, qty, firstId, lastId, timestamp, isBuyerMaker].
+
+    Reads only qty/ts/isBuyerMaker and aggregates in Arrow; files the typed parser rejects go
+    through the permissive pandas path (per-column coercion, bad rows dropped).
+    """
+    data = _zip_bytes(path)
+    if data is None:
+        return pd.DataFrame()
+    cols = ["qty", "ts", "isBuyerMaker"]
+    try:
+        tbl = _csv_table(data, names=cols, usecols=[2, 5, 6], dtype=_AGG_TRADE_TYPES)
+    except (pa.ArrowInvalid, ValueError):
+        tbl = None
+    else:
+        return _taker_flow_arrow(tbl, names) if tbl is not None else pd.DataFrame()
+    df = pd.read_csv(io.BytesIO(data), header=None, names=cols, usecols=[2, 5, 6], low_memory=False)
+    df["qty"] = pd.to_numeric(df["qty"], errors="coerce")  # base qty
+    df["ts"] = _normalize_ts_ms(df["ts"], context=context)
+    df["isBuyerMaker"] = _to_int01_isbuyer(df["isBuyerMaker"])  # 1=sell (buyer is maker)
+    df = df.dropna(subset=["qty", "ts", "isBuyerMaker"])  # drop header rows
+    if df.empty:
+        return pd.DataFrame()
+    df["isBuyerMaker"] = df["isBuyerMaker"].astype(int)
+    df["minute"] = _to_minute_int(df["ts"])
+    return _taker_flow(df, names)
+
+
+# bookTicker column layouts: timestamp first, or symbol first and timestamp last
+_BOOK_TICKER_TYPES = {"ts": pa.int64(), "bidPrice": pa.float64(), "askPrice": pa.float64()}
+_BOOK_TICKER_LAYOUTS = [
+    ["ts", "symbol", "bidPrice", "bidQty", "askPrice", "askQty"],
+    ["symbol", "bidPrice", "bidQty", "askPrice", "askQty", "ts"],
+]
+
+
+def _book_ticker_layout(data: bytes) -> tuple:
+    """(column names, header rows to skip) for a bookTicker CSV, sniffed from its first data row.
+
+    data: the start of the file (a few KB is enough).
+
+    A numeric first field means the timestamp leads; a symbol there means the symbol-first layout.
+    Picking the layout up front parses the file once.
+    """
+    def numeric(field: bytes) -> bool:
+        try:
+            float(field)
+            return True
+        except ValueError:
+            return False
+
+    lines = data[:4096].splitlines()
+    # A header row has no numeric field at all (a symbol-first data row still has prices)
+    skip = int(bool(lines) and not any(numeric(x) for x in lines[0].split(b",")))
+    row = lines[skip] if len(lines) > skip else b""
+    ts_first = not row or numeric(row.split(b",", 1)[0])
+    return _BOOK_TICKER_LAYOUTS[0 if ts_first else 1], skip
+
+
+def _liq_per_minute(liq: pd.DataFrame) -> pd.DataFrame:
+    """Per-minute liquidation qty by side (BUY -> liq_long, SELL -> liq_short) and event count.
+
+    Side is upper-cased once and qty masked per side, so one groupby sum covers every minute; a
+    file without a side column cannot be split, so liq_long/liq_short are NaN and only liq_count
+    is filled. The count is stored as float32 (exact for integers below 2**24; it turns float
+    once joined with NaN minutes anyway).
+    """
+    qty = liq["qty"]
+    if "side" in liq:
+        side = liq["side"].str.upper()
+        sides = pd.DataFrame({"liq_long": qty.where(side == "BUY", 0.0), "liq_short": qty.where(side == "SELL", 0.0), "liq_count": qty})
+        per_min = sides.groupby(pd.Grouper(freq="min")).agg({"liq_long": "sum", "liq_short": "sum", "liq_count": "size"})
+    else:
+        per_min = qty.groupby(pd.Grouper(freq="min")).size().to_frame("liq_count")
+        per_min.insert(0, "liq_long", np.nan)
+        per_min.insert(1, "liq_short", np.nan)
+    return per_min.astype({"liq_count": np.float32})
+
+
+def _day_zip(raw: Path, symbol: str, date_str: str, ds: str) -> Path:
+    # Build expected file path
+    dir_map = {
+        "klines_1m": f"klines_1m/{symbol}-1m-{date_str}.zip",
+        "indexPriceKlines_1m": f"indexPriceKlines_1m/{symbol}-1m-{date_str}.zip",
+        "markPriceKlines_1m": f"markPriceKlines_1m/{symbol}-1m-{date_str}.zip",
+        "premiumIndexKlines_1m": f"premiumIndexKlines_1m/{symbol}-1m-{date_str}.zip",
+        "aggTrades": f"aggTrades/{symbol}-aggTrades-{date_str}.zip",
+        "bookTicker": f"bookTicker/{symbol}-bookTicker-{date_str}.zip",
+        "spot_aggTrades": f"spot_aggTrades/{symbol}-aggTrades-{date_str}.zip",
+    }
+    return raw / dir_map[ds]
+
+
+# Zips a day's bars are built from (spot only with include_spot)
+_DAY_DATASETS = ["indexPriceKlines_1m", "markPriceKlines_1m", "premiumIndexKlines_1m", "aggTrades", "bookTicker"]
+
+# Part of every minute_cache file name: bump whenever _build_one_day's output changes, so days
+# cached by an older builder are missed and rebuilt instead of mixed with fresh ones
+DAY_CACHE_VERSION = 1
+
+
+def _build_one_day(dt: pd.Timestamp, raw: Path, symbol: str, include_spot: bool = False) -> pd.DataFrame:
+    """One UTC day of 1-minute bars (1440 rows) from that day's zips under raw/<dataset>/."""
+    logger = logging.getLogger(__name__)
+    date_str = dt.strftime("%Y-%m-%d")
+
+    def p(ds: str) -> Path:
+        return _day_zip(raw, symbol, date_str, ds)
+
+    # index price klines (1m): [open time, open, high, low, close, close time, ...]
+    logger.debug(
+        f"paths date={date_str} index={p('indexPriceKlines_1m').exists()} mark={p('markPriceKlines_1m').exists()} prem={p('premiumIndexKlines_1m').exists()} agg={p('aggTrades').exists()} bt={p('bookTicker').exists()} spot={p('spot_aggTrades').exists()}"
+    )
+    idx_cols = [
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "close_time",
+        "v1",
+        "v2",
+        "v3",
+        "v4",
+        "v5",
+        "v6",
+    ]
+    df_index = _read_zip_csv(p("indexPriceKlines_1m"), names=idx_cols, usecols=[0, 4], dtype=_KLINE_TYPES)
+    if not df_index.empty:
+        df_index.rename(columns={"open_time": "ts", "close": "index_px"}, inplace=True)
+        df_index["ts"] = pd.to_numeric(df_index["ts"], errors="coerce")
+        df_index["index_px"] = pd.to_numeric(df_index["index_px"], errors="coerce")
+        df_index = df_index.dropna(subset=["ts"])  # drop header if present
+    logger.debug(f"read index df rows={len(df_index)} date={date_str}")
+
+    # mark price klines (1m)
+    df_mark = _read_zip_csv(p("markPriceKlines_1m"), names=idx_cols, usecols=[0, 4], dtype=_KLINE_TYPES)
+    if not df_mark.empty:
+        df_mark.rename(columns={"open_time": "ts", "close": "perp_mark"}, inplace=True)
+        df_mark["ts"] = pd.to_numeric(df_mark["ts"], errors="coerce")
+        df_mark["perp_mark"] = pd.to_numeric(df_mark["perp_mark"], errors="coerce")
+        df_mark = df_mark.dropna(subset=["ts"])  # drop header if present
+    logger.debug(f"read mark df rows={len(df_mark)} date={date_str}")
+
+    # premiumIndexKlines (1m): use close as premium proxy
+    df_prem = _read_zip_csv(p("premiumIndexKlines_1m"), names=idx_cols, usecols=[0, 4], dtype=_KLINE_TYPES)
+    if not df_prem.empty:
+        df_prem.rename(columns={"open_time": "ts", "close": "premium"}, inplace=True)
+        df_prem["ts"] = pd.to_numeric(df_prem["ts"], errors="coerce")
+        df_prem["premium"] = pd.to_numeric(df_prem["premium"], errors="coerce")
+        df_prem = df_prem.dropna(subset=["ts"])  # drop header if present
+    logger.debug(f"read premium df rows={len(df_prem)} date={date_str}")
+
+    # aggTrades -> per-minute taker buy/sell and volume
+    df_cvd = _agg_trades_flow(p("aggTrades"), ("taker_buy_qty", "taker_sell_qty", "vol_perp"), context="perp_aggTrades")
+    logger.debug(f"aggTrades cvd_index_len={len(df_cvd.index)} date={date_str}")
+
+    # bookTicker: [ts, symbol, bidPrice, bidQty, askPrice, askQty] (schema may vary)
+    df_bt = pd.DataFrame()
+    bt_zip = p("bookTicker")
+    if bt_zip.exists():
+        with zipfile.ZipFile(bt_zip, "r") as zf:
+            fname = zf.namelist()[0]
+            # Sniff the layout from the head, then parse the entry as a stream (the day's
+            # quotes are never held decompressed in one buffer)
+            with zf.open(fname) as f:
+                head = f.read(4096)
+            if head:
+                cols, skip = _book_ticker_layout(head)
+                try:
+                    # Typed Arrow parse of just ts/bid/ask (symbol and sizes are never converted)
+                    with zf.open(fname) as f:
+                        tbl = pacsv.read_csv(
+                            f,
+                            read_options=pacsv.ReadOptions(column_names=cols, skip_rows=skip, use_threads=True),
+                            convert_options=pacsv.ConvertOptions(
+                                include_columns=list(_BOOK_TICKER_TYPES), column_types=_BOOK_TICKER_TYPES
+                            ),
+                        )
+                    df_bt = tbl.to_pandas(split_blocks=True, self_destruct=True)
+                    del tbl
+                except (pa.ArrowInvalid, ValueError):
+                    # Ragged or malformed rows: permissive pandas parse, coerced per column below
+                    with zf.open(fname) as f:
+                        df_bt = pd.read_csv(f, header=None, names=cols, skiprows=skip, low_memory=False)
+                logger.debug(f"read bookTicker variant={cols} rows={len(df_bt)} date={date_str}")
+    if not df_bt.empty:
+        for c in ["bidPrice", "askPrice"]:
+            df_bt[c] = _safe_float(df_bt[c])
+        if "ts" in df_bt.columns:
+            df_bt["ts"] = _normalize_ts_ms(df_bt["ts"], context="bookTicker")
+            df_bt = df_bt.dropna(subset=["ts"])  # drop header if present
+            df_bt.loc[:, "minute"] = _to_minute_int(df_bt["ts"])
+            # Latest quote per minute: after a stable sort on ts the rows, and so the minutes, are in
+            # time order, and last() keeps each minute's final quote (the groupby key sort is skipped)
+            df_bt = df_bt.sort_values("ts", kind="stable").groupby("minute", sort=False).last()
+        mid = (df_bt["bidPrice"] + df_bt["askPrice"]) / 2.0
+        spread_bps = (df_bt["askPrice"] - df_bt["bidPrice"]) / mid * 10000.0
+        df_liq = pd.DataFrame({
+            "spread_bps": spread_bps
+        })
+    else:
+        df_liq = pd.DataFrame()
+    logger.debug(f"bookTicker df rows={len(df_bt)} liq_rows={len(df_liq)} date={date_str}")
+
+    # spot aggTrades (optional)
+    df_spot = pd.DataFrame()
+    if include_spot:
+        df_spot = _agg_trades_flow(
+            p("spot_aggTrades"), ("taker_buy_qty_spot", "taker_sell_qty_spot", "vol_spot"), context="spot_aggTrades"
+        )
+
+    # Merge all by minute: every part is keyed by int64 epoch-ms minutes, scattered by minute-of-day
+    # into one preallocated (1440, n_cols) block instead of a chain of index-aligning joins
+    parts = []
+    if not df_index.empty:
+        parts.append(df_index[["index_px"]].set_axis(_to_minute_int(df_index["ts"]), axis=0))
+    if not df_mark.empty:
+        parts.append(df_mark[["perp_mark"]].set_axis(_to_minute_int(df_mark["ts"]), axis=0))
+    if not df_prem.empty:
+        parts.append(df_prem[["premium"]].set_axis(_to_minute_int(df_prem["ts"]), axis=0))
+    parts += [part for part in (df_cvd, df_liq, df_spot) if not part.empty]
+    cols = [c for part in parts for c in part.columns]
+    day_start_ms = dt.value // 1_000_000
+    buf = np.full((MINUTES_PER_DAY, len(cols)), np.nan)
+    j = 0
+    for part in parts:
+        rows = (part.index.to_numpy(dtype=np.int64) - day_start_ms) // 60_000
+        in_day = (rows >= 0) & (rows < MINUTES_PER_DAY)
+        buf[rows[in_day], j : j + part.shape[1]] = part.to_numpy(dtype=np.float64)[in_day]
+        j += part.shape[1]
+    df_day = pd.DataFrame(buf, index=pd.date_range(dt, periods=MINUTES_PER_DAY, freq="min"), columns=cols)
+    logger.debug(f"df_day date={date_str} shape={df_day.shape} cols={list(df_day.columns)}")
+    return df_day
+
+
+def _load_or_build_day(
+    dt: pd.Timestamp, raw: Path, symbol: str, include_spot: bool = False, cache_dir: Optional[Path] = None
+) -> pd.DataFrame:
+    """_build_one_day behind a per-day parquet cache in cache_dir (disabled when None).
+
+    A cached day is reused while it was written by this DAY_CACHE_VERSION and is at least as new
+    as every source zip of that day; days with no source zips are never cached, so a later
+    download is picked up.
+    """
+    if cache_dir is None:
+        return _build_one_day(dt, raw, symbol, include_spot)
+    date_str = dt.strftime("%Y-%m-%d")
+    datasets = _DAY_DATASETS + (["spot_aggTrades"] if include_spot else [])
+    mtimes = [z.stat().st_mtime for z in (_day_zip(raw, symbol, date_str, ds) for ds in datasets) if z.exists()]
+    cache_path = Path(cache_dir) / f"{date_str}{'_spot' if include_spot else ''}.v{DAY_CACHE_VERSION}.parquet"
+    if mtimes and cache_path.exists() and cache_path.stat().st_mtime >= max(mtimes):
+        logging.getLogger(__name__).debug(f"minute_cache.hit date={date_str} path={cache_path}")
+        return pd.read_parquet(cache_path)
+    df_day = _build_one_day(dt, raw, symbol, include_spot)
+    if mtimes:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        df_day.to_parquet(tmp, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
+        os.replace(tmp, cache_path)
+    return df_day
 
 
 def build_minute_frame(
@@ -83,234 +485,59 @@ def build_minute_frame(
     include_spot: bool = False,
     progress: bool = False,
     ingest_dir: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    cache_dir: Optional[os.PathLike | str] = None,
 ) -> pd.DataFrame:
     """
     Build a unified 1-minute DataFrame from daily zip files between start and end.
     Columns: index_px, perp_mark, premium, bid, ask, spread_bps, taker_buy_qty, taker_sell_qty, vol_perp, vol_spot (opt)
+    executor: optional (process) pool to build the days on; serial when None.
+    cache_dir: optional per-day parquet cache (see _load_or_build_day); every day is rebuilt when None.
     """
     logger = logging.getLogger(__name__)
     raw = Path(raw_dir) / symbol
     logger.debug(f"minute_builder.start symbol={symbol} raw_dir={raw} start={start} end={end} include_spot={include_spot}")
     ingest_base = Path(ingest_dir) if ingest_dir else Path("data/ingest-binance")
 
-    # aggregate per day then concat
-    frames: List[pd.DataFrame] = []
+    # aggregate per day then concat; days are independent (separate zips), so an executor can
+    # build them in parallel (map keeps date order)
     date_range = pd.date_range(start=start, end=end, freq="D", tz="UTC")
-    iterator = date_range
+    cache = Path(cache_dir) if cache_dir is not None else None
+    if executor is not None and len(date_range) > 1:
+        days = executor.map(_load_or_build_day, date_range, repeat(raw), repeat(symbol), repeat(include_spot), repeat(cache))
+    else:
+        days = (_load_or_build_day(dt, raw, symbol, include_spot, cache) for dt in date_range)
     if progress:
         try:
             from tqdm.auto import tqdm  # type: ignore
-            iterator = tqdm(date_range, desc=f"{symbol} days", leave=True)
+            days = tqdm(days, total=len(date_range), desc=f"{symbol} days", leave=True)
         except Exception:
-            iterator = date_range
-    for dt in iterator:
-        date_str = dt.strftime("%Y-%m-%d")
-
-        def p(ds: str) -> Path:
-            # Build expected file path
-            dir_map = {
-                "klines_1m": f"klines_1m/{symbol}-1m-{date_str}.zip",
-                "indexPriceKlines_1m": f"indexPriceKlines_1m/{symbol}-1m-{date_str}.zip",
-                "markPriceKlines_1m": f"markPriceKlines_1m/{symbol}-1m-{date_str}.zip",
-                "premiumIndexKlines_1m": f"premiumIndexKlines_1m/{symbol}-1m-{date_str}.zip",
-                "aggTrades": f"aggTrades/{symbol}-aggTrades-{date_str}.zip",
-                "bookTicker": f"bookTicker/{symbol}-bookTicker-{date_str}.zip",
-                "spot_aggTrades": f"spot_aggTrades/{symbol}-aggTrades-{date_str}.zip",
-            }
-            return raw / dir_map[ds]
-
-        # index price klines (1m): [open time, open, high, low, close, close time, ...]
-        logger.debug(
-            f"paths date={date_str} index={p('indexPriceKlines_1m').exists()} mark={p('markPriceKlines_1m').exists()} prem={p('premiumIndexKlines_1m').exists()} agg={p('aggTrades').exists()} bt={p('bookTicker').exists()} spot={p('spot_aggTrades').exists()}"
-        )
-        idx_cols = [
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "close_time",
-            "v1",
-            "v2",
-            "v3",
-            "v4",
-            "v5",
-            "v6",
-        ]
-        df_index = _read_zip_csv(p("indexPriceKlines_1m"), names=idx_cols, usecols=[0, 4])
-        if not df_index.empty:
-            df_index.rename(columns={"open_time": "ts", "close": "index_px"}, inplace=True)
-            df_index["ts"] = pd.to_numeric(df_index["ts"], errors="coerce")
-            df_index["index_px"] = pd.to_numeric(df_index["index_px"], errors="coerce")
-            df_index = df_index.dropna(subset=["ts"])  # drop header if present
-        logger.debug(f"read index df rows={len(df_index)} date={date_str}")
-
-        # mark price klines (1m)
-        df_mark = _read_zip_csv(p("markPriceKlines_1m"), names=idx_cols, usecols=[0, 4])
-        if not df_mark.empty:
-            df_mark.rename(columns={"open_time": "ts", "close": "perp_mark"}, inplace=True)
-            df_mark["ts"] = pd.to_numeric(df_mark["ts"], errors="coerce")
-            df_mark["perp_mark"] = pd.to_numeric(df_mark["perp_mark"], errors="coerce")
-            df_mark = df_mark.dropna(subset=["ts"])  # drop header if present
-        logger.debug(f"read mark df rows={len(df_mark)} date={date_str}")
-
-        # premiumIndexKlines (1m): use close as premium proxy
-        df_prem = _read_zip_csv(p("premiumIndexKlines_1m"), names=idx_cols, usecols=[0, 4])
-        if not df_prem.empty:
-            df_prem.rename(columns={"open_time": "ts", "close": "premium"}, inplace=True)
-            df_prem["ts"] = pd.to_numeric(df_prem["ts"], errors="coerce")
-            df_prem["premium"] = pd.to_numeric(df_prem["premium"], errors="coerce")
-            df_prem = df_prem.dropna(subset=["ts"])  # drop header if present
-        logger.debug(f"read premium df rows={len(df_prem)} date={date_str}")
-
-        # aggTrades: [id, price, qty, firstId, lastId, timestamp, isBuyerMaker]
-        at_cols = [
-            "aggId",
-            "price",
-            "qty",
-            "firstId",
-            "lastId",
-            "ts",
-            "isBuyerMaker",
-        ]
-        # Only read the needed columns to reduce memory footprint
-        df_at = _read_zip_csv(p("aggTrades"), names=["qty", "ts", "isBuyerMaker"], usecols=[2, 5, 6])
-        if not df_at.empty:
-            # Coerce types and drop header rows accidentally read as data
-            df_at["qty"] = pd.to_numeric(df_at["qty"], errors="coerce")  # base qty
-            df_at["ts"] = _normalize_ts_ms(df_at["ts"], context="perp_aggTrades")
-            df_at["isBuyerMaker"] = _to_int01_isbuyer(df_at["isBuyerMaker"])  # 1=sell (buyer is maker)
-            df_at = df_at.dropna(subset=["qty", "ts", "isBuyerMaker"])  # drop header line if present
-            df_at["isBuyerMaker"] = df_at["isBuyerMaker"].astype(int)
-            df_at["minute"] = _to_minute_index(df_at["ts"]).astype("datetime64[ns, UTC]")
-            # Aggregate without groupby.apply to avoid shape issues
-            sell = df_at.loc[df_at["isBuyerMaker"] == 1].groupby("minute")["qty"].sum()
-            buy = df_at.loc[df_at["isBuyerMaker"] == 0].groupby("minute")["qty"].sum()
-            vol = df_at.groupby("minute")["qty"].sum()
-            df_cvd = pd.concat(
-                [
-                    buy.rename("taker_buy_qty"),
-                    sell.rename("taker_sell_qty"),
-                    vol.rename("vol_perp"),
-                ],
-                axis=1,
-            )
-        else:
-            df_cvd = pd.DataFrame()
-        logger.debug(f"read aggTrades rows={len(df_at)} cvd_index_len={len(df_cvd.index) if not df_cvd.empty else 0} date={date_str}")
-
-        # bookTicker: [ts, symbol, bidPrice, bidQty, askPrice, askQty] (schema may vary)
-        bt_cols_variants = [
-            ["ts", "symbol", "bidPrice", "bidQty", "askPrice", "askQty"],
-            ["symbol", "bidPrice", "bidQty", "askPrice", "askQty", "ts"],
-        ]
-        df_bt = pd.DataFrame()
-        bt_zip = p("bookTicker")
-        if bt_zip.exists():
-            with zipfile.ZipFile(bt_zip, "r") as zf:
-                fname = zf.namelist()[0]
-                with zf.open(fname) as f:
-                    raw_bytes = f.read()
-                for cols in bt_cols_variants:
-                    try:
-                        tmp = pd.read_csv(io.BytesIO(raw_bytes), header=None, names=cols, low_memory=False)
-                        df_bt = tmp
-                        logger.debug(f"read bookTicker variant={cols} rows={len(df_bt)} date={date_str}")
-                        break
-                    except Exception:
-                        continue
-        if not df_bt.empty:
-            for c in ["bidPrice", "askPrice"]:
-                df_bt[c] = _safe_float(df_bt[c])
-            if "ts" in df_bt.columns:
-                df_bt["ts"] = _normalize_ts_ms(df_bt["ts"], context="bookTicker")
-                df_bt = df_bt.dropna(subset=["ts"])  # drop header if present
-                df_bt.loc[:, "minute"] = _to_minute_index(df_bt["ts"]).astype("datetime64[ns, UTC]")
-                df_bt = df_bt.sort_values("minute").groupby("minute").last()
-            mid = (df_bt["bidPrice"] + df_bt["askPrice"]) / 2.0
-            spread_bps = (df_bt["askPrice"] - df_bt["bidPrice"]) / mid * 10000.0
-            df_liq = pd.DataFrame({
-                "spread_bps": spread_bps
-            })
-        else:
-            df_liq = pd.DataFrame()
-        logger.debug(f"bookTicker df rows={len(df_bt)} liq_rows={len(df_liq)} date={date_str}")
-
-        # spot aggTrades (optional)
-        df_spot = pd.DataFrame()
-        if include_spot and p("spot_aggTrades").exists():
-            # Minimize columns for spot aggTrades as well
-            df_s = _read_zip_csv(p("spot_aggTrades"), names=["qty", "ts", "isBuyerMaker"], usecols=[2, 5, 6])
-            if not df_s.empty:
-                df_s["qty"] = pd.to_numeric(df_s["qty"], errors="coerce")
-                df_s["ts"] = _normalize_ts_ms(df_s["ts"], context="spot_aggTrades")
-                df_s["isBuyerMaker"] = _to_int01_isbuyer(df_s["isBuyerMaker"])  # 1=sell (buyer is maker)
-                df_s = df_s.dropna(subset=["qty", "ts", "isBuyerMaker"])  # drop header rows
-                df_s["isBuyerMaker"] = df_s["isBuyerMaker"].astype(int)
-                df_s.loc[:, "minute"] = _to_minute_index(df_s["ts"]).astype("datetime64[ns, UTC]")
-                # Vectorized groupby aggregation (faster than groupby.apply)
-                buy_s = df_s.loc[df_s["isBuyerMaker"] == 0].groupby("minute")["qty"].sum()
-                sell_s = df_s.loc[df_s["isBuyerMaker"] == 1].groupby("minute")["qty"].sum()
-                vol_s = df_s.groupby("minute")["qty"].sum()
-                df_spot = pd.concat(
-                    [
-                        buy_s.rename("taker_buy_qty_spot"),
-                        sell_s.rename("taker_sell_qty_spot"),
-                        vol_s.rename("vol_spot"),
-                    ],
-                    axis=1,
-                )
-
-        # Merge all by minute index
-        if not df_index.empty:
-            df_index = df_index.copy()
-            df_index["minute"] = _to_minute_index(df_index["ts"]).astype("datetime64[ns, UTC]")
-            df_index.drop(columns=["ts"], inplace=True)
-            df_index.set_index("minute", inplace=True)
-        if not df_mark.empty:
-            df_mark = df_mark.copy()
-            df_mark["minute"] = _to_minute_index(df_mark["ts"]).astype("datetime64[ns, UTC]")
-            df_mark.drop(columns=["ts"], inplace=True)
-            df_mark.set_index("minute", inplace=True)
-        if not df_prem.empty:
-            df_prem = df_prem.copy()
-            df_prem["minute"] = _to_minute_index(df_prem["ts"]).astype("datetime64[ns, UTC]")
-            df_prem.drop(columns=["ts"], inplace=True)
-            df_prem.set_index("minute", inplace=True)
-
-        df_day = pd.DataFrame(index=pd.date_range(dt, dt + pd.Timedelta(days=1) - pd.Timedelta(minutes=1), freq="min", tz="UTC"))
-        if not df_index.empty:
-            df_day = df_day.join(df_index[["index_px"]], how="left")
-        if not df_mark.empty:
-            df_day = df_day.join(df_mark[["perp_mark"]], how="left")
-        if not df_prem.empty:
-            df_day = df_day.join(df_prem[["premium"]], how="left")
-        if not df_cvd.empty:
-            df_day = df_day.join(df_cvd, how="left")
-        if not df_liq.empty:
-            df_day = df_day.join(df_liq, how="left")
-        if not df_spot.empty:
-            df_day = df_day.join(df_spot, how="left")
-        logger.debug(f"df_day date={date_str} shape={df_day.shape} cols={list(df_day.columns)}")
-        frames.append(df_day)
+            pass
+    frames: List[pd.DataFrame] = list(days)
 
     if not frames:
         return pd.DataFrame()
 
-    df = pd.concat(frames).sort_index()
+    # Days come back in date order, each on its own ascending minute index, so the concat is already
+    # sorted; the O(n) check only guards the sort
+    df = pd.concat(frames)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     logger.debug(f"concat frames total_shape={df.shape}")
-    # forward fill prices for continuous series
-    for c in ["index_px", "perp_mark", "premium"]:
-        if c in df.columns:
-            df[c] = df[c].ffill()
+    # forward fill prices for continuous series (one ffill over the price columns together)
+    price_cols = [c for c in ["index_px", "perp_mark", "premium"] if c in df.columns]
+    if price_cols:
+        df[price_cols] = df[price_cols].ffill()
 
     df["data_ok"] = True
     # mark data_ok false if last price stale > 2 minutes
-    valid_price = df[[c for c in ["index_px", "perp_mark"] if c in df.columns]].notna().any(axis=1)
-    last_ts = df.index.to_series().where(valid_price).ffill()
-    staleness = (df.index.to_series() - last_ts).dt.total_seconds() / 60.0
-    stale_cnt = int((staleness > 2).sum())
-    df.loc[staleness > 2, "data_ok"] = False
+    # (positions of the last valid row via a running max, then one int64 ns difference)
+    valid_price = df[[c for c in ["index_px", "perp_mark"] if c in df.columns]].notna().to_numpy().any(axis=1)
+    idx_ns = df.index.values.astype("datetime64[ns]").view(np.int64)
+    last_pos = np.maximum.accumulate(np.where(valid_price, np.arange(len(df)), -1))
+    stale = (last_pos >= 0) & (idx_ns - idx_ns[np.maximum(last_pos, 0)] > 2 * 60_000_000_000)
+    stale_cnt = int(stale.sum())
+    df.loc[stale, "data_ok"] = False
     logger.debug(f"final symbol={symbol} shape={df.shape} stale_minutes={stale_cnt}")
 
     # Enrich from REST ingestion if available
@@ -335,22 +562,10 @@ def build_minute_frame(
             df = df.join(oi1m[["oi"]], how="left")
         if (ing_sym_dir / "liquidations.parquet").exists():
             liq = pd.read_parquet(ing_sym_dir / "liquidations.parquet").sort_index()
-            grp = liq.groupby(pd.Grouper(freq="1T"))
-            liq_min = pd.DataFrame({
-                "liq_long": grp.apply(lambda g: g.loc[g.get("side", "BUY").str.upper() == "BUY", "qty"].sum()),
-                "liq_short": grp.apply(lambda g: g.loc[g.get("side", "SELL").str.upper() == "SELL", "qty"].sum()),
-                "liq_count": grp.size(),
-            })
-            df = df.join(liq_min, how="left")
+            df = df.join(_liq_per_minute(liq), how="left")
         elif (ing_sym_dir / "liq_coinalyze.parquet").exists():
             liq = pd.read_parquet(ing_sym_dir / "liq_coinalyze.parquet").sort_index()
-            grp = liq.groupby(pd.Grouper(freq="1T"))
-            liq_min = pd.DataFrame({
-                "liq_long": grp.apply(lambda g: g.loc[g.get("side", "BUY").str.upper() == "BUY", "qty"].sum()),
-                "liq_short": grp.apply(lambda g: g.loc[g.get("side", "SELL").str.upper() == "SELL", "qty"].sum()),
-                "liq_count": grp.size(),
-            })
-            df = df.join(liq_min, how="left")
+            df = df.join(_liq_per_minute(liq), how="left")
     except Exception as e:
         logger.exception(f"ingest_enrich_failed symbol={symbol} error={e}")
 
@@ -360,5 +575,7 @@ def build_minute_frame(
 def save_minute_parquet(df: pd.DataFrame, processed_dir: os.PathLike | str, symbol: str) -> Path:
     out = Path(processed_dir) / symbol / "minute.parquet"
     out.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(out)
+    # float64 numpy blocks hand their buffers to Arrow without conversion; zstd + footer
+    # statistics like every other parquet this pipeline writes
+    df.to_parquet(out, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
     return out
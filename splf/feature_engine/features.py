@@ -9,13 +9,53 @@ from typing import Dict, Iterable, List, Optional
 import numpy as np
 import pandas as pd
 
+from ..utils.io import PARQUET_WRITE_OPTIONS
 
-def _rolling_sum(s: pd.Series, window_min: int) -> pd.Series:
-    return s.rolling(f"{window_min}T", min_periods=1).sum()
 
+# Minute-frame columns read by compute_features_1m (passed through to the feature frame)
+MINUTE_INPUT_COLUMNS = [
+    "index_px",
+    "perp_mark",
+    "premium",
+    "spread_bps",
+    "taker_buy_qty",
+    "taker_sell_qty",
+    "vol_perp",
+    "taker_buy_qty_spot",
+    "taker_sell_qty_spot",
+    "vol_spot",
+    "data_ok",
+    "funding_now",
+    "oi",
+    "liq_long",
+    "liq_short",
+    "liq_count",
+]
 
-def _rolling_std(s: pd.Series, window_min: int) -> pd.Series:
-    return s.rolling(f"{window_min}T", min_periods=max(2, window_min)).std()
+
+def _is_minute_grid(index: pd.Index) -> bool:
+    """True for a sorted DatetimeIndex with exactly one minute between consecutive rows."""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return False
+    step = np.diff(index.asi8)
+    return bool((step == step[0]).all()) and index[1] - index[0] == pd.Timedelta(minutes=1)
+
+
+def _window(window_min: int, minute_grid: bool, min_periods: int = 1):
+    # On a gap-free 1-min grid the "{w}min" time window (t - w, t] is exactly the last w rows; a
+    # fixed row count skips the per-call variable-window bounds pass. Gappy frames keep time windows,
+    # and so do windows shorter than min_periods (pandas rejects those for a fixed window; the time
+    # window just yields NaN).
+    return window_min if minute_grid and window_min >= min_periods else f"{window_min}min"
+
+
+def _rolling_sum(s: pd.Series, window_min: int, minute_grid: bool = False) -> pd.Series:
+    return s.rolling(_window(window_min, minute_grid), min_periods=1).sum()
+
+
+def _rolling_std(s: pd.Series, window_min: int, minute_grid: bool = False) -> pd.Series:
+    mp = max(2, window_min)
+    return s.rolling(_window(window_min, minute_grid, mp), min_periods=mp).std()
 
 
 def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> pd.DataFrame:
@@ -23,7 +63,10 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
     Compute SPLF features on 1-minute grid; features reflect 5-minute logic using rolling windows.
     Returns a DataFrame indexed by minute with engineered columns.
     """
-    df = df_minute.copy()
+    # Shallow copy: input columns are shared, not duplicated; every write below assigns a whole
+    # new column, which never writes into df_minute's arrays
+    df = df_minute.copy(deep=False)
+    grid = _is_minute_grid(df.index)
 
     # Basis related
     if {"perp_mark", "index_px"}.issubset(df.columns):
@@ -32,7 +75,7 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
         df["basis_now"] = np.nan
 
     for w in config.get("features", {}).get("basis_twap_minutes", [60, 120]):
-        df[f"basis_TWAP_{w}m"] = df["basis_now"].rolling(f"{w}T", min_periods=max(2, w)).mean()
+        df[f"basis_TWAP_{w}m"] = df["basis_now"].rolling(_window(w, grid, max(2, w)), min_periods=max(2, w)).mean()
 
     # Basis momentum (per spec): change vs 5m/15m ago on 1-minute grid
     df["dbasis_5m"] = df["basis_now"] - df["basis_now"].shift(5)
@@ -41,7 +84,7 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
     # Premium as funding proxy
     if "premium" in df.columns:
         for w in [60, 120, 480]:
-            df[f"premium_TWAP_{w}m"] = df["premium"].rolling(f"{w}T", min_periods=max(2, w)).mean()
+            df[f"premium_TWAP_{w}m"] = df["premium"].rolling(_window(w, grid, max(2, w)), min_periods=max(2, w)).mean()
         # Perp impulse ≈ basis_now − funding_TWAP_proxy (use premium TWAP as proxy)
         df["perp_impulse"] = df["basis_now"] - df["premium_TWAP_120m"].fillna(df["premium_TWAP_60m"]).fillna(df.get("premium_TWAP_480m"))
         # Backward-compatible alias
@@ -52,18 +95,18 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
     # Flow & share
     for w in config.get("features", {}).get("cvd_windows_min", [5, 15]):
         if "taker_buy_qty" in df.columns and "taker_sell_qty" in df.columns:
-            df[f"cvd_perp_{w}m"] = _rolling_sum(df["taker_buy_qty"] - df["taker_sell_qty"], w)
+            df[f"cvd_perp_{w}m"] = _rolling_sum(df["taker_buy_qty"] - df["taker_sell_qty"], w, grid)
         else:
             df[f"cvd_perp_{w}m"] = np.nan
 
         if "taker_buy_qty_spot" in df.columns and "taker_sell_qty_spot" in df.columns:
-            df[f"cvd_spot_{w}m"] = _rolling_sum(df["taker_buy_qty_spot"] - df["taker_sell_qty_spot"], w)
+            df[f"cvd_spot_{w}m"] = _rolling_sum(df["taker_buy_qty_spot"] - df["taker_sell_qty_spot"], w, grid)
         else:
             df[f"cvd_spot_{w}m"] = np.nan
 
     if {"vol_perp", "vol_spot"}.issubset(df.columns):
-        volp = _rolling_sum(df["vol_perp"], 60)
-        vols = _rolling_sum(df["vol_spot"], 60)
+        volp = _rolling_sum(df["vol_perp"], 60, grid)
+        vols = _rolling_sum(df["vol_spot"], 60, grid)
         df["perp_share_60m"] = volp / (volp + vols).replace(0, np.nan)
         df["dperp_share_60m"] = df["perp_share_60m"].diff()
     else:
@@ -84,7 +127,7 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
     else:
         ret1m = pd.Series(index=df.index, dtype=float)
 
-    df["rv_15m"] = ret1m.rolling("15T", min_periods=5).std()
+    df["rv_15m"] = ret1m.rolling(_window(15, grid, 5), min_periods=5).std()
 
     # Funding-derived features (if available via ingestion)
     if "funding_now" in df.columns:
@@ -100,7 +143,7 @@ def compute_features_1m(df_minute: pd.DataFrame, symbol: str, config: Dict) -> p
     # Liquidations (if available in minute aggregation)
     for c in ["liq_long", "liq_short", "liq_count"]:
         if c in df.columns:
-            df[f"{c}_15m"] = df[c].rolling("15T", min_periods=1).sum()
+            df[f"{c}_15m"] = _rolling_sum(df[c], 15, grid)
 
     # Meta flags
     if {"perp_mark", "index_px"}.issubset(df.columns):
@@ -121,12 +164,20 @@ def resample_to_5m(df_1m: pd.DataFrame) -> pd.DataFrame:
             agg[c] = "sum"
         else:
             agg[c] = "last"
-    df_5m = df_1m.resample("5T").agg(agg)
+    if not _is_minute_grid(df_1m.index):
+        # gaps: resample also emits the empty 5m bins between them
+        return df_1m.resample("5min").agg(agg)
+    # Gap-free grid: every 5m bin is non-empty, so grouping on the floored int64 timestamp gives the
+    # same bins without resample's binner, and the bins are consecutive from the first one
+    idx_ns = df_1m.index.values.astype("datetime64[ns]").view(np.int64)
+    bucket = idx_ns - idx_ns % (5 * 60_000_000_000)
+    df_5m = df_1m.groupby(bucket, sort=False).agg(agg)
+    df_5m.index = pd.date_range(df_1m.index[0].floor("5min"), periods=len(df_5m), freq="5min", name=df_1m.index.name)
     return df_5m
 
 
 def save_features_parquet(df: pd.DataFrame, features_dir: os.PathLike | str, symbol: str) -> Path:
     out = Path(features_dir) / symbol / "features_5m.parquet"
     out.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(out)
+    df.to_parquet(out, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
     return out
@@ -8,6 +8,12 @@ import pandas as pd
 from sklearn.ensemble import IsolationForest as SkIsolationForest
 from sklearn.preprocessing import RobustScaler
 
+try:
+    from numba import njit, prange  # type: ignore
+    _HAS_NUMBA = True
+except Exception:  # pragma: no cover
+    _HAS_NUMBA = False
+
 try:
     import cupy as cp  # type: ignore
     from cuml.ensemble import IsolationForest as CuIsolationForest  # type: ignore
@@ -37,6 +43,70 @@ FEATURE_COLUMNS_DEFAULT = [
 ]
 
 
+def _average_path_length(n: np.ndarray) -> np.ndarray:
+    # c(n): average unsuccessful-search path length in an n-sample isolation tree (as sklearn)
+    n = np.asarray(n, dtype=np.float64)
+    out = np.zeros(n.shape)
+    out[n == 2] = 1.0
+    big = n > 2
+    out[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return out
+
+
+def _pack_forest(model: SkIsolationForest) -> Tuple[np.ndarray, ...]:
+    """Flatten a fitted sklearn IsolationForest into node arrays for _forest_depths_nb.
+
+    Per node: feature as a column of the full matrix (-2 at leaves), threshold, children as global
+    node ids and the leaf term depth + c(n_node_samples) - 1 that IsolationForest sums per tree.
+    Returns (roots, feature, threshold, children, leaf_depth).
+    """
+    roots, feature, threshold, children, leaf_depth = [], [], [], [], []
+    offset = 0
+    for est, feats in zip(model.estimators_, model.estimators_features_):
+        t = est.tree_
+        # Trees index their estimator's feature subset; map to full-matrix columns (identity when
+        # the forest does not subsample features)
+        f = np.where(t.feature >= 0, np.asarray(feats)[np.maximum(t.feature, 0)], t.feature)
+        roots.append(offset)
+        feature.append(f)
+        threshold.append(t.threshold)
+        children.append(np.stack([t.children_left, t.children_right], axis=1) + offset)
+        leaf_depth.append(t.compute_node_depths() + _average_path_length(t.n_node_samples) - 1.0)
+        offset += t.node_count
+    return (
+        np.asarray(roots, dtype=np.int64),
+        np.concatenate(feature).astype(np.int32),
+        np.concatenate(threshold).astype(np.float64),
+        np.ascontiguousarray(np.concatenate(children), dtype=np.int32),
+        np.concatenate(leaf_depth).astype(np.float64),
+    )
+
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, cache=True)
+    def _forest_depths_nb(X, roots, feature, threshold, children, leaf_depth):  # pragma: no cover - compiled
+        # Per-row sum of leaf terms over all trees. Row blocks run in parallel; inside a block each
+        # tree is walked for every row before the next one, so its nodes stay in cache and the
+        # per-row summation order matches sklearn's.
+        n = X.shape[0]
+        out = np.zeros(n)
+        block = 256
+        for b in prange((n + block - 1) // block):
+            lo = b * block
+            hi = min(n, lo + block)
+            for t in range(roots.shape[0]):
+                root = roots[t]
+                for i in range(lo, hi):
+                    node = root
+                    f = feature[node]
+                    while f >= 0:
+                        node = children[node, 1 if X[i, f] > threshold[node] else 0]
+                        f = feature[node]
+                    out[i] += leaf_depth[node]
+        return out
+
+
 @dataclass
 class IFConfig:
     contamination: float = 0.04
@@ -51,6 +121,8 @@ class IFModel:
         self.config = config or IFConfig()
         self.scaler = RobustScaler()
         self.backend = backend  # 'auto' | 'sklearn' | 'cuml'
+        self.columns_: Optional[List[str]] = None  # feature columns resolved at fit time
+        self._packed: Optional[Tuple[np.ndarray, ...]] = None  # flattened trees (sklearn backend + numba)
         self._use_cuml = (_HAS_CUML and backend in ("auto", "cuml"))
         if backend == "cuml" and not _HAS_CUML:
             import warnings
@@ -67,14 +139,28 @@ class IFModel:
                 n_jobs=-1,
             )
 
-    def _select(self, df: pd.DataFrame) -> pd.DataFrame:
-        cols = [c for c in self.features if c in df.columns]
-        X = df[cols].replace([np.inf, -np.inf], np.nan).fillna(0.0)
-        return X
+    def _select(self, df: pd.DataFrame) -> np.ndarray:
+        """Feature matrix in the fitted column order, inf/NaN -> 0."""
+        if self.columns_ is None:
+            self.columns_ = [c for c in self.features if c in df.columns]
+        X = df[self.columns_].to_numpy(dtype=np.float64)
+        # New array: to_numpy may hand back a (read-only under copy-on-write) view of df
+        return np.where(np.isfinite(X), X, 0.0)
 
-    def fit(self, df: pd.DataFrame) -> "IFModel":
+    def _scale(self, df: pd.DataFrame, fit: bool = False) -> np.ndarray:
+        """Robust-scaled features as C-contiguous float32, the forest's tree dtype, so sklearn
+        does not copy the window again on fit / decision_function (scaling itself stays float64).
+
+        The fitted center_/scale_ are applied directly, as RobustScaler.transform would, without
+        its per-call input validation.
+        """
         X = self._select(df)
-        Xs = self.scaler.fit_transform(X)
+        if fit:
+            self.scaler.fit(X)
+        Xs = (X - self.scaler.center_) / self.scaler.scale_
+        return np.ascontiguousarray(Xs, dtype=np.float32)
+
+    def _fit_scaled(self, Xs: np.ndarray) -> None:
         if self._use_cuml:
             # Create cuML model on demand
             self.model = CuIsolationForest(
@@ -86,11 +172,28 @@ class IFModel:
             self.model.fit(X_gpu)
         else:
             self.model.fit(Xs)
+            # Scoring walks the trees serially in sklearn; a compiled walk is parallel over rows.
+            # Packing needs Tree.compute_node_depths (scikit-learn >= 1.3); older versions keep
+            # scoring through decision_function.
+            packable = _HAS_NUMBA and hasattr(self.model.estimators_[0].tree_, "compute_node_depths")
+            self._packed = _pack_forest(self.model) if packable else None
+
+    def fit(self, df: pd.DataFrame) -> "IFModel":
+        self.columns_ = None  # re-resolved from this window's columns
+        self._fit_scaled(self._scale(df, fit=True))
         return self
 
+    def fit_score(self, df: pd.DataFrame) -> pd.Series:
+        """fit(df) then score(df), selecting and scaling the window once for both."""
+        self.columns_ = None
+        Xs = self._scale(df, fit=True)
+        self._fit_scaled(Xs)
+        return self._score_scaled(Xs, df.index)
+
     def score(self, df: pd.DataFrame) -> pd.Series:
-        X = self._select(df)
-        Xs = self.scaler.transform(X)
+        return self._score_scaled(self._scale(df), df.index)
+
+    def _score_scaled(self, Xs: np.ndarray, index: pd.Index) -> pd.Series:
         if self._use_cuml:
             X_gpu = cp.asarray(Xs)
             raw = None
@@ -106,7 +209,13 @@ class IFModel:
                     preds = self.model.predict(X_gpu)
                     # cuML returns 1 for inliers, -1 for outliers; map to {0,1}
                     raw = (cp.asnumpy(preds) == -1).astype(float)
+        elif self._packed is not None:
+            # Same arithmetic as sklearn: decision_function = -2 ** (-depth / c(max_samples)) - offset_
+            depths = _forest_depths_nb(Xs, *self._packed)
+            denom = len(self.model.estimators_) * _average_path_length(np.array([self.model.max_samples_]))[0]
+            anomaly = 2 ** (-np.divide(depths, denom, out=np.ones_like(depths), where=denom != 0))
+            raw = -(-anomaly - self.model.offset_)
         else:
             # Higher is more anomalous → invert decision function
             raw = -self.model.decision_function(Xs)
-        return pd.Series(raw, index=df.index, name="if_score")
+        return pd.Series(raw, index=index, name="if_score")
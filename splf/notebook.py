@@ -1,24 +1,83 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
 from tqdm.auto import tqdm
 
-from .utils.io import ensure_dir, load_yaml, save_json
+from .utils.io import ensure_dir, load_yaml, read_parquet_subset, resolve_symbols, resolve_workers, save_json, write_alerts
+from .runtime.pool import get_pool
 from .data_handler.downloader import BinanceDownloader
 from .data_handler.minute_builder import build_minute_frame, save_minute_parquet
-from .feature_engine.features import compute_features_1m, resample_to_5m, save_features_parquet
-from .backtesting.runner import BacktestConfig, run_walk_forward
+from .feature_engine.features import MINUTE_INPUT_COLUMNS, compute_features_1m, resample_to_5m, save_features_parquet
+from .backtesting.runner import FEAT_COLS, MIN_COLS, BacktestConfig, run_walk_forward
 from .backtesting.labeling import compute_explosion_labels
 from .backtesting.metrics import compute_metrics
 
 
-def _symbols_from_cfg(cfg: dict) -> List[str]:
-    uni = cfg.get("universe", {})
-    return uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", []))
+# Per-symbol bodies of the SPLFNotebook stages; module-level so the process pool can pickle them
+
+
+def _minute_one(sym: str, cfg: Dict[str, Any], return_df: bool, executor=None, progress: bool = False) -> Union[Path, pd.DataFrame]:
+    paths, period = cfg["paths"], cfg["period"]
+    include_spot = cfg.get("datasets", {}).get("spot_aggTrades", False)
+    spot_for = set(cfg.get("features", {}).get("spot_for", []))
+    force = cfg.get("runtime", {}).get("force", False)  # rebuild days instead of reusing minute_cache
+    df = build_minute_frame(
+        paths["raw_dir"],
+        sym,
+        period["start"],
+        period["end"],
+        include_spot=include_spot and (sym in spot_for),
+        progress=progress,
+        ingest_dir=paths.get("ingest_dir"),
+        executor=executor,
+        cache_dir=None if force else Path(paths["processed_dir"]) / sym / "minute_cache",
+    )
+    if df.empty:
+        return pd.DataFrame()
+    out = save_minute_parquet(df, paths["processed_dir"], sym)
+    return df if return_df else out
+
+
+def _features_one(sym: str, cfg: Dict[str, Any], return_df: bool) -> Union[Path, pd.DataFrame]:
+    paths = cfg["paths"]
+    p = Path(paths["processed_dir"]) / sym / "minute.parquet"
+    if not p.exists():
+        return pd.DataFrame()
+    # Same column projection as the compute_features script
+    df_1m = read_parquet_subset(p, cfg.get("features", {}).get("input_columns") or MINUTE_INPUT_COLUMNS)
+    df_feat_1m = compute_features_1m(df_1m, sym, cfg)
+    df_feat_5m = resample_to_5m(df_feat_1m)
+    out = save_features_parquet(df_feat_5m, paths["features_dir"], sym)
+    return df_feat_5m if return_df else out
+
+
+def _backtest_one(sym: str, paths: Dict[str, Any], bt_cfg: BacktestConfig) -> pd.DataFrame:
+    p_min = Path(paths["processed_dir"]) / sym / "minute.parquet"
+    p_feat = Path(paths["features_dir"]) / sym / "features_5m.parquet"
+    if not p_min.exists() or not p_feat.exists():
+        return pd.DataFrame()
+    # Only the columns the walk-forward touches, as in the run_backtest script
+    df_1m = read_parquet_subset(p_min, MIN_COLS)
+    df_5m = read_parquet_subset(p_feat, FEAT_COLS)
+    alerts = run_walk_forward(df_1m, df_5m, sym, bt_cfg)
+    write_alerts(Path(paths["artifacts_dir"]) / "alerts", sym, alerts)
+    return alerts
+
+
+def _analyze_one(sym: str, paths: Dict[str, Any], horizons: List[int]) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+    p_alerts = Path(paths["artifacts_dir"]) / "alerts" / f"{sym}.csv"
+    p_min = Path(paths["processed_dir"]) / sym / "minute.parquet"
+    if not p_alerts.exists() or not p_min.exists():
+        return None
+    alerts = pd.read_csv(p_alerts, parse_dates=["ts"])
+    # Only perp_mark is needed: read that one column chunk instead of the whole minute frame
+    price_1m = pd.read_parquet(p_min, columns=["perp_mark"])["perp_mark"].ffill().bfill()
+    return alerts, compute_explosion_labels(price_1m, alerts, horizons)
 
 
 @dataclass
@@ -39,10 +98,22 @@ class SPLFNotebook:
 
     def __post_init__(self):
         self.cfg = load_yaml(self.config) if isinstance(self.config, (str, Path)) else dict(self.config)
+        # Pool workers load the YAML once when there is one; tasks carry self.cfg either way
+        self._cfg_path = str(self.config) if isinstance(self.config, (str, Path)) else None
         self.paths = self.cfg["paths"]
-        self.symbols = _symbols_from_cfg(self.cfg)
+        self.symbols = resolve_symbols(self.cfg)
         self.horizons = self.cfg.get("backtest", {}).get("horizons_min", [30, 60, 90, 120])
 
+    def _map(self, fn: Callable, sym_list: List[str], desc: str, *args) -> List[Any]:
+        """fn(sym, *args) per symbol, in symbol order; spread over the shared process pool when
+        runtime.workers allows more than one worker (symbols are independent)."""
+        workers = resolve_workers(self.cfg, len(sym_list))
+        if workers > 1 and len(sym_list) > 1:
+            results = get_pool(workers, self._cfg_path).map(fn, sym_list, *(repeat(a) for a in args))
+        else:
+            results = (fn(sym, *args) for sym in sym_list)
+        return list(tqdm(results, total=len(sym_list), desc=desc))
+
     # ------------------------
     # Data download
     # ------------------------
@@ -61,44 +132,22 @@ class SPLFNotebook:
     # ------------------------
     def build_minute(self, symbols: Optional[List[str]] = None, return_df: bool = False) -> Dict[str, Union[Path, pd.DataFrame]]:
         sym_list = symbols or self.symbols
+        if resolve_workers(self.cfg, len(sym_list)) > 1 and len(sym_list) > 1:
+            results = self._map(_minute_one, sym_list, "Minute bars (symbols)", self.cfg, return_df)
+            return dict(zip(sym_list, results))
+        # Symbols run one after another: spread each symbol's days over the pool instead
         period = self.cfg["period"]
-        include_spot = self.cfg.get("datasets", {}).get("spot_aggTrades", False)
-        spot_for = set(self.cfg.get("features", {}).get("spot_for", []))
-        outputs: Dict[str, Union[Path, pd.DataFrame]] = {}
-        for sym in tqdm(sym_list, desc="Minute bars (symbols)"):
-            df = build_minute_frame(
-                self.paths["raw_dir"],
-                sym,
-                period["start"],
-                period["end"],
-                include_spot=include_spot and (sym in spot_for),
-                progress=True,
-                ingest_dir=self.paths.get("ingest_dir"),
-            )
-            if df.empty:
-                outputs[sym] = pd.DataFrame()
-                continue
-            out = save_minute_parquet(df, self.paths["processed_dir"], sym)
-            outputs[sym] = df if return_df else out
-        return outputs
+        n_days = len(pd.date_range(period["start"], period["end"], freq="D"))
+        day_workers = resolve_workers(self.cfg, n_days)
+        ex = get_pool(day_workers, self._cfg_path) if day_workers > 1 and n_days > 1 else None
+        return {sym: _minute_one(sym, self.cfg, return_df, ex, progress=True) for sym in tqdm(sym_list, desc="Minute bars (symbols)")}
 
     # ------------------------
     # Features
     # ------------------------
     def features(self, symbols: Optional[List[str]] = None, return_df: bool = False) -> Dict[str, Union[Path, pd.DataFrame]]:
         sym_list = symbols or self.symbols
-        outputs: Dict[str, Union[Path, pd.DataFrame]] = {}
-        for sym in tqdm(sym_list, desc="Features"):
-            p = Path(self.paths["processed_dir"]) / sym / "minute.parquet"
-            if not p.exists():
-                outputs[sym] = pd.DataFrame()
-                continue
-            df_1m = pd.read_parquet(p)
-            df_feat_1m = compute_features_1m(df_1m, sym, self.cfg)
-            df_feat_5m = resample_to_5m(df_feat_1m)
-            out = save_features_parquet(df_feat_5m, self.paths["features_dir"], sym)
-            outputs[sym] = df_feat_5m if return_df else out
-        return outputs
+        return dict(zip(sym_list, self._map(_features_one, sym_list, "Features", self.cfg, return_df)))
 
     # ------------------------
     # Backtest
@@ -115,20 +164,7 @@ class SPLFNotebook:
             mask_funding_minutes=int(cfgbt.get("mask_funding_minutes", 10)),
             model_backend=self.cfg.get("model", {}).get("backend", "auto"),
         )
-        outputs: Dict[str, pd.DataFrame] = {}
-        out_dir = ensure_dir(Path(self.paths["artifacts_dir"]) / "alerts")
-        for sym in tqdm(sym_list, desc="Backtest"):
-            p_min = Path(self.paths["processed_dir"]) / sym / "minute.parquet"
-            p_feat = Path(self.paths["features_dir"]) / sym / "features_5m.parquet"
-            if not p_min.exists() or not p_feat.exists():
-                outputs[sym] = pd.DataFrame()
-                continue
-            df_1m = pd.read_parquet(p_min)
-            df_5m = pd.read_parquet(p_feat)
-            alerts = run_walk_forward(df_1m, df_5m, sym, bt_cfg)
-            alerts.to_csv(out_dir / f"{sym}.csv", index=False)
-            outputs[sym] = alerts
-        return outputs
+        return dict(zip(sym_list, self._map(_backtest_one, sym_list, "Backtest", self.paths, bt_cfg)))
 
     # ------------------------
     # Analysis
@@ -138,16 +174,10 @@ class SPLFNotebook:
         horizons = self.horizons
         all_alerts = []
         all_outcomes = []
-        for sym in tqdm(sym_list, desc="Analyze"):
-            p_alerts = Path(self.paths["artifacts_dir"]) / "alerts" / f"{sym}.csv"
-            p_min = Path(self.paths["processed_dir"]) / sym / "minute.parquet"
-            if not p_alerts.exists() or not p_min.exists():
-                continue
-            alerts = pd.read_csv(p_alerts, parse_dates=["ts"])
-            price_1m = pd.read_parquet(p_min)["perp_mark"].fillna(method="ffill").fillna(method="bfill")
-            outcomes = compute_explosion_labels(price_1m, alerts, horizons)
-            all_alerts.append(alerts)
-            all_outcomes.append(outcomes)
+        for res in self._map(_analyze_one, sym_list, "Analyze", self.paths, horizons):
+            if res is not None:
+                all_alerts.append(res[0])
+                all_outcomes.append(res[1])
 
         if not all_alerts:
             return {}, pd.DataFrame()
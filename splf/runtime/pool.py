@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.io import load_yaml
+
+# Worker-side state, set by init_worker (pool initializer; also called in-process for serial runs)
+_CFG: Dict[str, Any] = {}
+
+# Parent-side state: one pool and one log listener per interpreter, reused across pipeline stages
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_KEY: Optional[Tuple[int, str]] = None
+_LOG_QUEUE = None
+_LISTENER: Optional[QueueListener] = None
+
+# Imported once by the forkserver so each worker forks with them already loaded
+_PRELOAD = [
+    "numpy",
+    "pandas",
+    "pyarrow.parquet",
+    "splf.data_handler.minute_builder",
+    "splf.feature_engine.features",
+    "splf.backtesting.runner",
+]
+_MP_CONTEXT = None
+
+
+def _mp_context():
+    """forkserver where available (the parent runs a log-listener thread, which plain fork can
+    deadlock on), with the heavy imports preloaded; the platform default otherwise."""
+    global _MP_CONTEXT
+    if _MP_CONTEXT is None:
+        if "forkserver" in mp.get_all_start_methods():
+            _MP_CONTEXT = mp.get_context("forkserver")
+            _MP_CONTEXT.set_forkserver_preload(_PRELOAD)
+        else:  # pragma: no cover - Windows
+            _MP_CONTEXT = mp.get_context()
+    return _MP_CONTEXT
+
+
+def init_worker(cfg_path: Optional[str], log_queue=None, log_level: int = logging.INFO) -> None:
+    """Load the config once per process (none when cfg_path is empty: tasks then carry their
+    own config); in pool workers also route logging to the parent's queue."""
+    global _CFG
+    _CFG = load_yaml(cfg_path) if cfg_path else {}
+    if log_queue is not None:
+        root = logging.getLogger()
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.setLevel(log_level)
+        root.addHandler(QueueHandler(log_queue))
+
+
+def worker_config() -> Dict[str, Any]:
+    return _CFG
+
+
+def start_log_listener(make_handlers: Callable[[], List[logging.Handler]]):
+    """Start (once) the single listener that writes records from every process; returns its queue."""
+    global _LOG_QUEUE, _LISTENER
+    if _LISTENER is None:
+        _LOG_QUEUE = _mp_context().Queue(-1)
+        _LISTENER = QueueListener(_LOG_QUEUE, *make_handlers(), respect_handler_level=True)
+        _LISTENER.start()
+    return _LOG_QUEUE
+
+
+def _stop_log_listener() -> None:
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+
+def get_pool(workers: int, cfg_path: Optional[str]) -> ProcessPoolExecutor:
+    """Process pool shared by pipeline stages; rebuilt only if the worker count or config changes.
+
+    Workers log through the listener queue when one is running at creation time (a queue that
+    nobody drains would block worker shutdown, so none is wired otherwise).
+    """
+    global _POOL, _POOL_KEY
+    key = (int(workers), str(cfg_path or ""))
+    if _POOL is not None and _POOL_KEY == key:
+        return _POOL
+    shutdown_pool()
+    log_queue = _LOG_QUEUE if _LISTENER is not None else None
+    _POOL = ProcessPoolExecutor(
+        max_workers=key[0],
+        mp_context=_mp_context(),
+        initializer=init_worker,
+        initargs=(cfg_path, log_queue, logging.getLogger().level),
+    )
+    _POOL_KEY = key
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL, _POOL_KEY
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL, _POOL_KEY = None, None
+
+
+def _shutdown() -> None:
+    # Join workers first so their last records reach the queue before the listener stops
+    shutdown_pool()
+    _stop_log_listener()
+
+
+atexit.register(_shutdown)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:  # pragma: no cover
+    _HAS_ORJSON = False
+
+
+def json_loads(content: bytes) -> Any:
+    """Decode a JSON response body (bytes) with orjson when installed, else the stdlib.
+
+    Both raise a ValueError subclass on malformed input.
+    """
+    if _HAS_ORJSON:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _retry(retries: int, backoff_factor: float, status_forcelist: Iterable[int]) -> Retry:
+    # Retries honor Retry-After; once exhausted the last response is returned
+    # (raise_on_status=False) so callers keep their own status handling.
+    return Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def make_session(
+    pool_size: int = 32,
+    retries: int = 5,
+    backoff_factor: float = 0.3,
+    status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Session:
+    """Create a keep-alive Session with a sized connection pool and urllib3 retries."""
+    sess = requests.Session()
+    if headers:
+        sess.headers.update(headers)
+    retry = _retry(retries, backoff_factor, status_forcelist)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+def make_pool_manager(
+    pool_size: int = 32,
+    retries: int = 5,
+    backoff_factor: float = 0.3,
+    status_forcelist: Iterable[int] = (429, 500, 502, 503, 504),
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30.0,
+) -> urllib3.PoolManager:
+    """Bare urllib3 pool (same retry policy as make_session) for hot GET loops.
+
+    Skips requests' cookie/redirect/hook layers; responses expose .status and .data (bytes).
+    block=True caps open connections per host at pool_size instead of opening throwaway extras.
+    """
+    return urllib3.PoolManager(
+        maxsize=pool_size,
+        block=True,
+        retries=_retry(retries, backoff_factor, status_forcelist),
+        headers=headers,
+        timeout=urllib3.Timeout(total=timeout),
+    )
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` acquisitions per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Set
 
 import yaml
 
+# Default Parquet write settings (pyarrow): zstd is much smaller than snappy on float/timestamp
+# series at similar decode speed; ~128k-row groups keep column pruning and parallel reads effective,
+# and per-group min/max statistics let readers skip groups outside a time filter.
+PARQUET_WRITE_OPTIONS: Dict[str, Any] = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 128_000,
+    "write_statistics": True,
+}
+
 
 def ensure_dir(path: os.PathLike | str) -> Path:
     p = Path(path)
@@ -13,9 +25,66 @@ def ensure_dir(path: os.PathLike | str) -> Path:
     return p
 
 
-def load_yaml(path: os.PathLike | str) -> Dict[str, Any]:
+# libyaml-backed loader when PyYAML was built with it; same safe subset as yaml.safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
     with open(path, "r") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def load_yaml(path: os.PathLike | str) -> Dict[str, Any]:
+    """Parse a YAML file, memoized per (path, mtime); callers get their own copy."""
+    p = os.path.abspath(path)
+    return copy.deepcopy(_load_yaml_cached(p, os.stat(p).st_mtime_ns))
+
+
+def resolve_symbols(cfg: Dict[str, Any]) -> List[str]:
+    """Symbols from universe.symbols, else the concatenated tier_a/tier_b/tier_c lists."""
+    uni = cfg.get("universe") or {}
+    return list(uni.get("symbols") or (uni.get("tier_a", []) + uni.get("tier_b", []) + uni.get("tier_c", [])))
+
+
+def _cgroup_quota_cpus() -> Optional[int]:
+    """CPU limit from the cgroup quota (v2 cpu.max, else v1 cfs_quota/period); None when unlimited."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return max(1, int(int(quota) // int(period)))
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "r") as f:
+            quota_us = int(f.read().strip())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", "r") as f:
+            period_us = int(f.read().strip())
+        if quota_us > 0 and period_us > 0:
+            return max(1, quota_us // period_us)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use: affinity mask capped by any cgroup CPU quota."""
+    try:
+        n = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        n = os.cpu_count() or 1
+    quota = _cgroup_quota_cpus()
+    return max(1, min(n, quota) if quota else n)
+
+
+def resolve_workers(cfg: Dict[str, Any], n_tasks: int) -> int:
+    """runtime.workers from config; None/0/"auto" means one per task, capped by available CPUs."""
+    cfg_workers = (cfg.get("runtime") or {}).get("workers")
+    if cfg_workers in (None, 0, "auto"):
+        return max(1, min(n_tasks, available_cpus()))
+    return int(cfg_workers)
 
 
 def save_json(path: os.PathLike | str, obj: Any) -> None:
@@ -32,7 +101,7 @@ def save_parquet(df, path: os.PathLike | str) -> None:
 
     p = Path(path)
     ensure_dir(p.parent)
-    df.to_parquet(p)
+    df.to_parquet(p, engine="pyarrow", **PARQUET_WRITE_OPTIONS)
 
 
 def read_parquet(path: os.PathLike | str):
@@ -42,8 +111,113 @@ def read_parquet(path: os.PathLike | str):
     return None if not p.exists() else __import__("pandas").read_parquet(p)
 
 
+def read_parquet_subset(path: os.PathLike | str, columns: Optional[List[str]] = None):
+    """Read only the requested columns that exist in the file (file order kept; index restored)."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    if columns is None:
+        return pd.read_parquet(path, engine="pyarrow")
+    wanted = set(columns)
+    present = [c for c in pq.read_schema(path).names if c in wanted]
+    return pd.read_parquet(path, columns=present, engine="pyarrow", use_threads=True, memory_map=True)
+
+
+def write_alerts(out_dir: os.PathLike | str, symbol: str, df) -> Path:
+    """Write a symbol's alerts as {symbol}.csv and {symbol}.parquet; returns the CSV path.
+
+    Every backtest writer goes through here so both files are always rewritten together (readers
+    prefer the parquet, see find_alerts / scan_alerts).
+    """
+    base = ensure_dir(out_dir)
+    out = base / f"{symbol}.csv"
+    df.to_csv(out, index=False)
+    df.to_parquet(base / f"{symbol}.parquet", engine="pyarrow", index=False, **PARQUET_WRITE_OPTIONS)
+    return out
+
+
+def find_alerts(alerts_dir: os.PathLike | str, symbol: str) -> Optional[Path]:
+    """Locate a symbol's alerts file, preferring columnar formats over CSV."""
+    base = Path(alerts_dir)
+    for ext in ("parquet", "feather", "csv"):
+        p = base / f"{symbol}.{ext}"
+        if p.exists():
+            return p
+    return None
+
+
+def scan_alerts(alerts_dir: os.PathLike | str) -> Dict[str, Path]:
+    """Map symbol → alerts file for every symbol in alerts_dir from one directory listing.
+
+    Same format preference as find_alerts (parquet, feather, csv) without a stat per symbol/format.
+    """
+    rank = {".parquet": 0, ".feather": 1, ".csv": 2}
+    found: Dict[str, Path] = {}
+    try:
+        entries = list(os.scandir(alerts_dir))
+    except FileNotFoundError:
+        return found
+    for entry in entries:
+        stem, ext = os.path.splitext(entry.name)
+        if ext not in rank or not entry.is_file():
+            continue
+        prev = found.get(stem)
+        if prev is None or rank[ext] < rank[prev.suffix]:
+            found[stem] = Path(entry.path)
+    return found
+
+
+def scan_subdirs(path: os.PathLike | str) -> Set[str]:
+    """Names of the immediate subdirectories of path (one listing; empty if path is missing)."""
+    try:
+        return {e.name for e in os.scandir(path) if e.is_dir()}
+    except FileNotFoundError:
+        return set()
+
+
+def read_alerts(path: os.PathLike | str, columns: Optional[List[str]] = None):
+    """Read an alerts file written by the backtest (Parquet, Feather or CSV)."""
+    import pandas as pd
+
+    p = Path(path)
+    if p.suffix == ".parquet":
+        return pd.read_parquet(p, columns=columns, engine="pyarrow")
+    if p.suffix == ".feather":
+        return pd.read_feather(p, columns=columns)
+    # Multi-threaded Arrow CSV parser with the backtest's alert columns typed up front (no inference)
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
+    column_types = {
+        "ts": pa.timestamp("ns", tz="UTC"),
+        "symbol": pa.string(),
+        "leader_state": pa.string(),
+        "if_score": pa.float64(),
+        "threshold": pa.float64(),
+    }
+    tbl = pacsv.read_csv(
+        p,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=4 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=columns,
+            strings_can_be_null=True,
+        ),
+    )
+    return tbl.to_pandas()
+
+
 def dt_floor_minute(ts):
     import pandas as pd
 
     return pd.to_datetime(ts, unit="ms", utc=True).floor("T")
 
+
+def concat_tables(tables):
+    """Concatenate Arrow tables once, unifying schemas (missing columns become null)."""
+    import pyarrow as pa
+
+    try:
+        return pa.concat_tables(tables, promote_options="default")
+    except TypeError:  # pyarrow < 14
+        return pa.concat_tables(tables, promote=True)